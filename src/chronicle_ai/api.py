@@ -5,6 +5,7 @@ RESTful API and minimal web UI for the diary-to-episodes app.
 """
 
 import os
+import threading
 from datetime import date
 from typing import Optional, List
 from pathlib import Path
@@ -16,7 +17,7 @@ from pydantic import BaseModel, Field
 
 from .models import Entry
 from .repository import get_repository, EntryRepository
-from .llm_client import process_entry, is_ollama_available
+from .llm_client import process_entry, is_ollama_available, prewarm
 from .exports import export_entry_to_markdown, export_weekly
 from . import __version__
 
@@ -93,6 +94,12 @@ app = FastAPI(
 )
 
 
+@app.on_event("startup")
+async def warm_up_ollama():
+    """Load the Ollama model in the background so the first request is fast."""
+    threading.Thread(target=prewarm, name="ollama-prewarm", daemon=True).start()
+
+
 # Serve static files (web UI)
 static_path = Path(__file__).parent.parent.parent / "static"
 if static_path.exists():
@@ -132,13 +139,12 @@ async def health_check():
     Returns system status including Ollama availability and entry count.
     """
     repo = get_repository()
-    entries = repo.list_entries()
     
     return HealthResponse(
         status="healthy",
         version=__version__,
         ollama_available=is_ollama_available(),
-        entry_count=len(entries)
+        entry_count=repo.count_entries()
     )
 
 
@@ -304,7 +310,7 @@ async def regenerate_entry(entry_id: int):
     # Clear and regenerate
     entry.narrative_text = None
     entry.title = None
-    process_entry(entry)
+    process_entry(entry, use_cache=False)
     
     repo.update_entry(entry)
     
@@ -8,6 +8,7 @@ from typing import List, Optional, Dict
 import json
 from .models import Season, Entry, SeasonArc, ConflictAnalysis
 from .llm_client import get_llm_client
+from .llm_utils import extract_json
 from .repository import get_repository
 
 
@@ -111,19 +112,15 @@ Focus on identifying threads that span multiple episodes and payoffs to earlier
 
     def _parse_llm_response(self, response_text: str) -> dict:
         """Extract JSON from LLM response."""
-        try:
-            # Try to find JSON block
-            import re
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group(0))
-            return json.loads(response_text)
-        except Exception:
-            # Fallback if parsing fails
-            return {
-                "summary": "Full analysis failed to parse. Raw response: " + response_text[:500] + "...",
-                "storylines": {},
-                "character_growth": "Analysis parsing failed.",
-                "motifs": [],
-                "finale_worthy_episodes": []
-            }
+        # Decodes the first JSON object, ignoring text before or after it
+        data = extract_json(response_text, "{")
+        if isinstance(data, dict):
+            return data
+        # Fallback if parsing fails
+        return {
+            "summary": "Full analysis failed to parse. Raw response: " + response_text[:500] + "...",
+            "storylines": {},
+            "character_growth": "Analysis parsing failed.",
+            "motifs": [],
+            "finale_worthy_episodes": []
+        }
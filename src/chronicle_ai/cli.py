@@ -10,7 +10,7 @@ from datetime import date
 
 from .models import Entry
 from .repository import get_repository
-from .llm_client import process_entry, is_ollama_available
+from .llm_client import process_entry, iter_process_entries, is_ollama_available
 from .recap import RecapGenerator
 from .exports import export_entry_to_markdown, export_weekly, export_daily
 from .season_manager import SeasonManager
@@ -286,7 +286,7 @@ def cmd_regenerate(args):
     # Clear existing and regenerate
     entry.narrative_text = None
     entry.title = None
-    process_entry(entry)
+    process_entry(entry, use_cache=False)
     
     repo.update_entry(entry)
     
@@ -334,7 +334,7 @@ def cmd_retitle(args):
             print("❌ Ollama not available.")
             return
         from .llm_client import generate_title_options
-        entry.title_options = generate_title_options(entry.narrative_text or entry.raw_text)
+        entry.title_options, _ = generate_title_options(entry.narrative_text or entry.raw_text, use_cache=False)
         repo.update_entry(entry)
     
     options = entry.title_options
@@ -480,16 +480,18 @@ def cmd_process(args):
     ) as progress:
         task = progress.add_task("Generating episodes...", total=len(to_process))
         
-        for entry in to_process:
-            progress.update(task, description=f"Processing {entry.date} (ID: {entry.id})...")
-            try:
-                # Fully process narrative, title, synopsis, and conflict
-                # This uses the existing logic in llm_client
-                process_entry(entry, force=args.force)
-                repo.update_entry(entry)
-                processed += 1
-            except Exception as e:
-                console.print(f"[red]❌ Error processing {entry.date} (ID {entry.id}): {str(e)}[/red]")
+        # Entries are generated in parallel threads; results are saved here
+        # on the main thread as each one finishes
+        for entry, error in iter_process_entries(to_process, force=args.force):
+            progress.update(task, description=f"Processed {entry.date} (ID: {entry.id})")
+            if error is None:
+                try:
+                    repo.update_entry(entry)
+                    processed += 1
+                except Exception as e:
+                    error = e
+            if error is not None:
+                console.print(f"[red]❌ Error processing {entry.date} (ID {entry.id}): {str(error)}[/red]")
                 failed += 1
             
             progress.advance(task)
@@ -4,15 +4,21 @@ Chronicle AI - Conflict Detector Module
 Identifies and analyzes conflicts within diary entries using LLM.
 """
 
-import json
+import time
 import logging
 from typing import Optional
 from .models import ConflictAnalysis
-from .llm_utils import _make_request
+from .llm_utils import _make_request, extract_json
 from .director import director_engine
 
 logger = logging.getLogger(__name__)
 
+# Keyword hints for the offline heuristic analysis
+_UNCERTAINTY_HINTS = ("doubt", "unsure", "scared", "fear", "worried", "think if")
+_EMOTIONAL_HINTS = ("sad", "depressed", "lonely")
+_PRESSURE_HINTS = ("deadline", "work", "boss", "client", "finish")
+_ENVIRONMENT_HINTS = ("traffic", "broken", "rain", "storm")
+
 class ConflictDetector:
     """
     Analyzes diary entries to detect internal and external conflicts,
@@ -45,23 +51,17 @@ Diary Entry:
 
 JSON Response:"""
 
-        import time
-        start = time.time()
+        start = time.perf_counter()
         result = _make_request(prompt)
-        duration = time.time() - start
+        duration = time.perf_counter() - start
         director_engine.perf_logger.log_event("conflict_analysis", duration)
         
         if result:
+            # Decodes the first JSON object in place, skipping markdown fences or chatter
+            data = extract_json(result, "{")
             try:
-                # Find JSON block if it's wrapped in markdown
-                json_str = result.strip()
-                if "```json" in json_str:
-                    json_str = json_str.split("```json")[1].split("```")[0].strip()
-                elif "```" in json_str:
-                    json_str = json_str.split("```")[1].split("```")[0].strip()
-                
-                data = json.loads(json_str)
-                
+                if not isinstance(data, dict):
+                    raise ValueError("no JSON object in response")
                 return ConflictAnalysis(
                     internal_conflicts=data.get("internal", []),
                     external_conflicts=data.get("external", []),
@@ -69,9 +69,9 @@ JSON Response:"""
                     archetype=data.get("archetype", "none"),
                     central_conflict=data.get("central_conflict", "")
                 )
-            except (json.JSONDecodeError, ValueError, KeyError) as e:
-                logger.warning(f"Failed to parse conflict analysis JSON: {e}")
-                logger.debug(f"Raw result: {result}")
+            except (ValueError, TypeError) as e:
+                logger.warning("Failed to parse conflict analysis JSON: %s", e)
+                logger.debug("Raw result: %s", result)
         
         # Fallback analysis based on simple keyword matching if LLM fails
         return self._fallback_analysis(raw_text)
@@ -82,16 +82,16 @@ JSON Response:"""
         analysis = ConflictAnalysis()
         
         # Internal hints
-        if any(w in lower_text for w in ["doubt", "unsure", "scared", "fear", "worried", "think if"]):
+        if any(w in lower_text for w in _UNCERTAINTY_HINTS):
             analysis.internal_conflicts.append("uncertainty")
-        if any(w in lower_text for w in ["sad", "depressed", "lonely"]):
+        if any(w in lower_text for w in _EMOTIONAL_HINTS):
             analysis.internal_conflicts.append("emotional struggle")
             
         # External hints
-        if any(w in lower_text for w in ["deadline", "work", "boss", "client", "finish"]):
+        if any(w in lower_text for w in _PRESSURE_HINTS):
             analysis.external_conflicts.append("pressure")
             analysis.archetype = "person vs time"
-        if any(w in lower_text for w in ["traffic", "broken", "rain", "storm"]):
+        if any(w in lower_text for w in _ENVIRONMENT_HINTS):
             analysis.external_conflicts.append("environmental hurdle")
             analysis.archetype = "person vs environment"
             
@@ -3,14 +3,19 @@ Chronicle AI - Director Engine
 Optimization, benchmarking, and quality control for narrative generation.
 """
 
+import re
 import time
 import json
 import logging
+from collections import Counter, deque
 from typing import Dict, List, Optional, Any
 from .models import Entry
 
 logger = logging.getLogger(__name__)
 
+# Sentence terminators; splitting on these matches treating ! and ? as full stops
+_SENT_SPLIT_RE = re.compile(r"[.!?]")
+
 class EpisodeStructure:
     """
     Validates the quality and structure of generated narratives.
@@ -27,13 +32,13 @@ class EpisodeStructure:
             return {"valid": False, "issues": ["Narrative is empty"]}
 
         issues = []
-        
+
         # Check length
         if len(narrative) < self.min_length:
             issues.append(f"Narrative too short ({len(narrative)} characters)")
 
         # Check sentence count
-        sentences = [s.strip() for s in narrative.replace('!', '.').replace('?', '.').split('.') if s.strip()]
+        sentences = [s for s in map(str.strip, _SENT_SPLIT_RE.split(narrative)) if s]
         if len(sentences) < self.min_sentences:
             issues.append(f"Insufficient sentences ({len(sentences)})")
 
@@ -44,7 +49,7 @@ class EpisodeStructure:
         # Check for proper structure (heuristic: look for pronouns/verbs)
         # For simplicity, we'll check if it looks like third person (he/she/they or name)
         # This is a bit complex for a simple validator, so we'll keep it basic.
-        
+
         return {
             "valid": len(issues) == 0,
             "issues": issues,
@@ -56,50 +61,43 @@ class EpisodeStructure:
         """Check for identical or highly similar sentences."""
         if not sentences:
             return False
-            
+
         seen = set()
         for s in sentences:
             s_clean = s.lower().strip()
             if s_clean in seen:
                 return True
             seen.add(s_clean)
-            
-        # Also check for repeating phrases (basic check)
+
+        # Also check for repeating phrases: any 4-word phrase used 3+ times
         words = " ".join(sentences).lower().split()
-        for i in range(len(words) - 5):
-            phrase = " ".join(words[i:i+4])
-            if " ".join(words).count(phrase) > 2:
-                # Basic check for repeated 4-word phrases
-                return True
-                
-        return False
+        phrase_counts = Counter(zip(words, words[1:], words[2:], words[3:]))
+        return any(count > 2 for count in phrase_counts.values())
 
 class PerformanceLogger:
     """
     Tracks and logs generation times for various components.
+    
+    Events are (timestamp, component, duration, metadata) tuples kept in a
+    bounded deque; appends are atomic, so worker threads can log without a lock.
     """
-    def __init__(self):
-        self.logs = []
+    def __init__(self, max_events: int = 65536):
+        self.logs = deque(maxlen=max_events)
 
     def log_event(self, component: str, duration: float, metadata: Optional[Dict] = None):
-        entry = {
-            "timestamp": time.time(),
-            "component": component,
-            "duration": duration,
-            "metadata": metadata or {}
-        }
-        self.logs.append(entry)
-        logger.info(f"Performance: {component} took {duration:.2f}s")
+        self.logs.append((time.time(), component, duration, metadata))
+        logger.info("Performance: %s took %.2fs", component, duration)
 
     def get_stats(self) -> Dict[str, Any]:
         if not self.logs:
             return {}
             
-        stats = {}
-        components = set(log["component"] for log in self.logs)
+        by_component: Dict[str, List[float]] = {}
+        for _, component, duration, _ in self.logs:
+            by_component.setdefault(component, []).append(duration)
         
-        for comp in components:
-            durations = [log["duration"] for log in self.logs if log["component"] == comp]
+        stats = {}
+        for comp, durations in by_component.items():
             stats[comp] = {
                 "avg": sum(durations) / len(durations),
                 "max": max(durations),
@@ -144,15 +142,15 @@ class DirectorEngine:
         """
         from .llm_client import process_entry
         results = []
-        total_start = time.time()
+        total_start = time.perf_counter()
         
         for i, entry in enumerate(sample_entries):
-            start_time = time.time()
+            start_time = time.perf_counter()
             
             # Use process_entry
             process_entry(entry)
             
-            duration = time.time() - start_time
+            duration = time.perf_counter() - start_time
             self.perf_logger.log_event("full_pipeline", duration, {"entry_id": entry.id or i})
             
             # Validate quality
@@ -164,7 +162,7 @@ class DirectorEngine:
                 "quality": quality
             })
 
-        total_duration = time.time() - total_start
+        total_duration = time.perf_counter() - total_start
         
         return {
             "total_duration": total_duration,
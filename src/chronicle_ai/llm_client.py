@@ -4,41 +4,325 @@ Chronicle AI - LLM Client
 Integration with local Ollama Llama 3.2 for narrative and title generation.
 """
 
+import time
+import asyncio
 import logging
-from typing import Optional, List, Dict
+from string import Template
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, List, Dict, Tuple, Iterator, Sequence
 
 from .models import ConflictAnalysis
+from .processor import KeywordClassifier
 from .style_guide import CinematicStyleGuide
-from .llm_utils import _make_request, is_ollama_available, OLLAMA_TIMEOUT
+# The Ollama transport (pooled client, config, errors) lives only in llm_utils;
+# it is re-exported here so both import paths share one client and cache
+from .llm_utils import (
+    _make_request, _make_request_async, is_ollama_available, load_model, extract_json,
+    OLLAMA_NUM_PARALLEL
+)
+# Not used in this module; kept so existing `from .llm_client import ...` callers still work
+from .llm_utils import (  # noqa: F401
+    OllamaError, OLLAMA_BASE_URL, OLLAMA_MODEL, OLLAMA_TIMEOUT
+)
 from .conflict import ConflictDetector
 from .director import director_engine
+from .semantic_cache import semantic_cache
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
 
 # Initialize the Cinematic Style Guide and Conflict Detector
 style_guide = CinematicStyleGuide()
 conflict_detector = ConflictDetector()
 
 
-# Redundant functions removed as they are now in llm_utils
+# Static parts of the narrative prompt; only the conflict context and entry text vary per call
+_NARRATIVE_HEAD = """You are a creative writer helping to transform personal diary entries into engaging narrative prose.
+
+Transform the following diary entry into a short, cinematic narrative paragraph (2-4 sentences). 
+Write in third person, present tense, as if describing scenes from a movie about the protagonist's life.
+Keep it personal and emotionally resonant while maintaining the key events and feelings.
+Use the identified conflicts to drive the narrative, treating them as the 'inciting incidents' or 'climax' of the story acts.
+"""
+_NARRATIVE_MID = "\n\nDiary entry:\n"
+_NARRATIVE_SUFFIX = "\n\nNarrative (2-4 sentences, cinematic style):"
+_NARRATIVE_TITLE_SUFFIX = """
+
+Also create a catchy, evocative episode title (3-7 words) that feels like a TV episode title.
+Respond with a JSON object: {"narrative": "<2-4 sentence cinematic narrative>", "title": "<episode title>"}"""
+
+# Single-slot prompts, compiled once; only the (truncated) text is substituted
+_TITLE_PROMPT = Template("""You are creating episode titles for a personal life documentary series.
 
+Generate a single catchy, evocative episode title (3-7 words) for this diary entry.
+The title should feel like a TV episode title - intriguing, memorable, and capturing the essence of the day.
+Respond with a JSON object of the form {"title": "<episode title>"} and nothing else.
+
+Diary content:
+$text
 
+JSON Output:""")
+
+# Structured-output schema so Ollama returns exactly {"title": "..."}
+_TITLE_SCHEMA = {
+    "type": "object",
+    "properties": {"title": {"type": "string", "maxLength": 64}},
+    "required": ["title"]
+}
+
+_TITLE_OPTIONS_PROMPT = Template("""You are creating episode titles for a personal life documentary series.
+Analyze the following diary content and generate 5 title options using these patterns:
+1. 'The One Where...' (Friends style)
+2. Single evocative word ('Pilot', 'Crossroads', 'Aftermath')
+3. Song, book, or movie reference relevant to content
+4. Metaphorical title
+5. Direct dramatic statement
+
+For each title, provide a 'relevance_score' (0.0 to 1.0) based on how well it matches keywords and mood.
+Output the result as a raw JSON list of objects with 'title', 'pattern', and 'score' keys.
+Do not include any other text, only the JSON.
+
+Example:
+[
+  {"title": "The One Where Dreams Collide", "pattern": "Friends-style", "score": 0.85},
+  {"title": "Crossroads", "pattern": "Single-word", "score": 0.92}
+]
+
+Diary content:
+$text
+
+JSON Output:""")
+
+_SYNOPSIS_PROMPT = Template("""You are an expert TV writer and metadata specialist.
+Analyze the following episode narrative and extract the following:
+1. LOGLINE: Exactly one sentence hook (max 15 words) with intrigue, no spoilers. 
+   Example: 'A critical deadline forces an unexpected alliance with an old rival.'
+2. SYNOPSIS: A 2-3 sentence summary for an episode listing.
+3. KEYWORDS: Exactly 5 searchable/filterable tags that capture themes or events.
+
+Output the result as a raw JSON object with 'logline', 'synopsis', and 'keywords' (list) keys.
+Do not include any other text, only the JSON.
+
+Episode Narrative:
+$text
+
+JSON Output:""")
+
+# Approximate characters per token, used when no tokenizer is installed
+_CHARS_PER_TOKEN = 4
+# Token budget for a full diary entry embedded in a prompt
+_ENTRY_TOKEN_BUDGET = 1024
+_tokenizer = None
+
+
+def _get_tokenizer():
+    """Lazily load the tiktoken encoding, or None if unavailable."""
+    global _tokenizer, TIKTOKEN_AVAILABLE
+    if _tokenizer is None and TIKTOKEN_AVAILABLE:
+        try:
+            _tokenizer = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            logger.warning("Could not load tokenizer, using character budgets: %s", e)
+            TIKTOKEN_AVAILABLE = False
+    return _tokenizer
+
+
+def _truncate_tokens(text: str, max_tokens: int) -> str:
+    """
+    Truncate text to roughly `max_tokens` tokens before it goes into a prompt.
+    
+    Prompt prefill cost grows with token count, so budgets are expressed in
+    tokens. Falls back to a character estimate when tiktoken is not installed.
+    """
+    # Every token covers at least one character
+    if len(text) <= max_tokens:
+        return text
+    tokenizer = _get_tokenizer()
+    if tokenizer is None:
+        return text[:max_tokens * _CHARS_PER_TOKEN]
+    ids = tokenizer.encode(text)
+    if len(ids) <= max_tokens:
+        return text
+    return tokenizer.decode(ids[:max_tokens])
+
+
+# Mood keywords in priority order: when several moods match, the earliest wins
+_MOOD_KEYWORDS = (
+    ("productive", ("productive", "finished", "accomplished", "work", "busy")),
+    ("reflective", ("sad", "reflective", "thought", "lonely", "missing")),
+    ("stressful", ("stress", "deadline", "fast", "rushed", "panic")),
+    ("relaxed", ("relax", "chill", "calm", "peace", "quiet")),
+    ("mysterious", ("mystery", "weird", "strange", "dark", "unknown")),
+)
+_MOOD_CLASSIFIER = KeywordClassifier(_MOOD_KEYWORDS)
+
+
+def prewarm() -> bool:
+    """
+    Open the pooled connection to Ollama and load the model ahead of time.
+    
+    Call at startup so the first real request doesn't pay the TCP handshake
+    and the multi-second model load.
+    
+    Returns:
+        True if Ollama is reachable and the model is loaded
+    """
+    if not is_ollama_available():
+        logger.info("Ollama not available; skipping prewarm")
+        return False
+    start = time.perf_counter()
+    loaded = load_model()
+    director_engine.perf_logger.log_event("prewarm", time.perf_counter() - start)
+    return loaded
+
+
+def _as_text(raw_text) -> str:
+    """Normalize diary text once, decoding bytes input as UTF-8."""
+    if isinstance(raw_text, bytes):
+        return raw_text.decode("utf-8", errors="replace")
+    return raw_text
+
+
+@lru_cache(maxsize=512)
 def detect_mood(raw_text: str) -> str:
-    """Detect mood from raw diary text."""
-    lower_text = raw_text.lower()
-    if any(w in lower_text for w in ["productive", "finished", "accomplished", "work", "busy"]):
-        return "productive"
-    elif any(w in lower_text for w in ["sad", "reflective", "thought", "lonely", "missing"]):
-        return "reflective"
-    elif any(w in lower_text for w in ["stress", "deadline", "fast", "rushed", "panic"]):
-        return "stressful"
-    elif any(w in lower_text for w in ["relax", "chill", "calm", "peace", "quiet"]):
-        return "relaxed"
-    elif any(w in lower_text for w in ["mystery", "weird", "strange", "dark", "unknown"]):
-        return "mysterious"
-    else:
-        return "neutral"
-
-
-def generate_narrative(raw_text: str, mood: Optional[str] = None, conflict_data: Optional[ConflictAnalysis] = None) -> str:
+    """Detect mood from raw diary text; results are memoized per text."""
+    return _MOOD_CLASSIFIER.classify(raw_text.lower()) or "neutral"
+
+
+_COVER_ANALYSIS_PROMPT = Template("""Analyze this narrative for a cover image.
+Return JSON with keys "mood" (one of: $moods) and "visuals" (2-3 key visual elements or striking images, short comma separated phrases; focus on tangible objects, settings, or poses).
+Narrative: $text
+JSON Output:""")
+
+_COVER_BATCH_PROMPT = Template("""Analyze each numbered narrative below for a cover image.
+Return JSON with key "covers": a list with one object per narrative, each with "index" (the narrative's number), "mood" (one of: $moods) and "visuals" (2-3 key visual elements or striking images, short comma separated phrases; focus on tangible objects, settings, or poses).
+$narratives
+JSON Output:""")
+
+# Generated tokens allowed per cover analysis
+_COVER_NUM_PREDICT = 96
+
+
+def _cover_schema(moods: Sequence[str]) -> Dict:
+    """JSON schema for one cover analysis, with the mood limited to `moods`."""
+    return {
+        "type": "object",
+        "properties": {
+            "mood": {"type": "string", "enum": list(moods)},
+            "visuals": {"type": "string"}
+        },
+        "required": ["mood", "visuals"]
+    }
+
+
+def _cover_result(data, text: str, moods: Sequence[str]) -> Dict[str, str]:
+    """Validate one parsed cover analysis, falling back to detect_mood."""
+    if not isinstance(data, dict):
+        data = {}
+    mood = data.get("mood")
+    visuals = data.get("visuals")
+    return {
+        "mood": mood if mood in moods else detect_mood(text or ""),
+        "visuals": visuals.strip().strip('"') if isinstance(visuals, str) else ""
+    }
+
+
+def analyze_for_cover(text: str, moods: Sequence[str]) -> Dict[str, str]:
+    """
+    Pick a cover mood and extract visual elements with one LLM call.
+    
+    The mood is constrained to `moods` through Ollama structured output, so
+    the narrative is only sent (and prefilled) once for both answers.
+    
+    Args:
+        text: Narrative or raw diary text
+        moods: Allowed mood names
+        
+    Returns:
+        Dict with "mood" (falls back to detect_mood) and "visuals" ("" if unavailable)
+    """
+    if not text or not text.strip():
+        return _cover_result(None, text, moods)
+    
+    prompt = _COVER_ANALYSIS_PROMPT.substitute(moods=", ".join(moods), text=text)
+    result = _make_request(prompt, timeout=20, format=_cover_schema(moods), num_predict=_COVER_NUM_PREDICT)
+    return _cover_result(extract_json(result, "{") if result else None, text, moods)
+
+
+async def analyze_for_cover_async(text: str, moods: Sequence[str]) -> Dict[str, str]:
+    """
+    Async version of analyze_for_cover (same prompt, so both share the response cache).
+    
+    Args:
+        text: Narrative or raw diary text
+        moods: Allowed mood names
+        
+    Returns:
+        Dict with "mood" (falls back to detect_mood) and "visuals" ("" if unavailable)
+    """
+    if not text or not text.strip():
+        return _cover_result(None, text, moods)
+    
+    prompt = _COVER_ANALYSIS_PROMPT.substitute(moods=", ".join(moods), text=text)
+    result = await _make_request_async(
+        prompt, timeout=20, format=_cover_schema(moods), num_predict=_COVER_NUM_PREDICT
+    )
+    return _cover_result(extract_json(result, "{") if result else None, text, moods)
+
+
+def analyze_for_cover_batch(texts: Sequence[str], moods: Sequence[str]) -> List[Dict[str, str]]:
+    """
+    Run analyze_for_cover for several narratives with a single LLM call.
+    
+    Narratives are numbered in the prompt and answers are matched back by
+    number, so a missing or invalid answer only falls back for that text.
+    
+    Args:
+        texts: Narrative or raw diary texts (empty ones are not sent)
+        moods: Allowed mood names
+        
+    Returns:
+        One analyze_for_cover-style dict per text, in input order
+    """
+    indexed = [(i, t) for i, t in enumerate(texts, 1) if t and t.strip()]
+    if len(indexed) <= 1:
+        return [analyze_for_cover(t, moods) for t in texts]
+    
+    schema = {
+        "type": "object",
+        "properties": {
+            "covers": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {"index": {"type": "integer"}, **_cover_schema(moods)["properties"]},
+                    "required": ["index", "mood", "visuals"]
+                }
+            }
+        },
+        "required": ["covers"]
+    }
+    narratives = "\n".join(f"[{i}] Narrative: {t}" for i, t in indexed)
+    prompt = _COVER_BATCH_PROMPT.substitute(moods=", ".join(moods), narratives=narratives)
+    result = _make_request(prompt, timeout=20, format=schema, num_predict=_COVER_NUM_PREDICT * len(indexed))
+    data = extract_json(result, "{") if result else None
+    
+    sent = {i for i, _ in indexed}
+    answers: Dict[int, Dict] = {}
+    for item in (data.get("covers") if isinstance(data, dict) else None) or ():
+        if isinstance(item, dict) and item.get("index") in sent:
+            answers.setdefault(item["index"], item)
+    return [_cover_result(answers.get(i), t, moods) for i, t in enumerate(texts, 1)]
+
+
+def generate_narrative(raw_text: str, mood: Optional[str] = None, conflict_data: Optional[ConflictAnalysis] = None,
+                       use_cache: bool = True) -> str:
     """
     Generate a narrative paragraph from raw diary text with cinematic enhancement.
     
@@ -49,147 +333,266 @@ def generate_narrative(raw_text: str, mood: Optional[str] = None, conflict_data:
         raw_text: The user's raw diary entry text
         mood: Optional mood to guide the cinematic style
         conflict_data: Optional ConflictAnalysis to drive the narrative structure
+        use_cache: If False, skip cached narratives and generate a fresh one
         
     Returns:
         Generated narrative paragraph or fallback text
     """
+    raw_text = _as_text(raw_text)
     if not raw_text or not raw_text.strip():
         return "No diary content provided for this day."
     
-    # 1. Detect mood if not explicitly provided
-    if not mood:
-        mood = detect_mood(raw_text)
-    
-    # 1.5 Incorporate conflict data into the prompt
-    conflict_context = ""
-    if conflict_data:
-        conflict_context = f"\nCentral Conflict: {conflict_data.central_conflict}"
-        if conflict_data.internal_conflicts:
-            conflict_context += f"\nInternal Struggles: {', '.join(conflict_data.internal_conflicts)}"
-        if conflict_data.external_conflicts:
-            conflict_context += f"\nExternal Obstacles: {', '.join(conflict_data.external_conflicts)}"
-        conflict_context += f"\nTension Level: {conflict_data.tension_level}/10"
-    
-    # 2. Prepare the base prompt
-    base_prompt = f"""You are a creative writer helping to transform personal diary entries into engaging narrative prose.
+    prompt = _build_narrative_prompt(raw_text, mood, conflict_data)
 
-Transform the following diary entry into a short, cinematic narrative paragraph (2-4 sentences). 
-Write in third person, present tense, as if describing scenes from a movie about the protagonist's life.
-Keep it personal and emotionally resonant while maintaining the key events and feelings.
-Use the identified conflicts to drive the narrative, treating them as the 'inciting incidents' or 'climax' of the story acts.
-{conflict_context}
+    # Check cache
+    cache_key = f"narrative_{hash(prompt)}"
+    semantic_context = _semantic_context(raw_text, mood, conflict_data)
+    if use_cache:
+        cached = director_engine.cache.get(cache_key) or semantic_cache.lookup(raw_text, semantic_context)
+        if cached:
+            return cached
 
-Diary entry:
-{raw_text}"""
+    # 4. Request from LLM
+    start = time.perf_counter()
+    result = _make_request(prompt, num_predict=256, use_cache=use_cache)
+    duration = time.perf_counter() - start
+    director_engine.perf_logger.log_event("generate_narrative", duration)
+    
+    return _finish_narrative(raw_text, result, cache_key, semantic_context)
 
-    # 3. Enhance the prompt with cinematic instructions
-    prompt = style_guide.enhance_prompt(base_prompt, mood)
-    prompt += "\n\nNarrative (2-4 sentences, cinematic style):"
 
-    # Check cache
+async def agenerate_narrative(raw_text: str, mood: Optional[str] = None, conflict_data: Optional[ConflictAnalysis] = None) -> str:
+    """
+    Async version of generate_narrative using the shared async HTTP client.
+    
+    Args:
+        raw_text: The user's raw diary entry text
+        mood: Optional mood to guide the cinematic style
+        conflict_data: Optional ConflictAnalysis to drive the narrative structure
+        
+    Returns:
+        Generated narrative paragraph or fallback text
+    """
+    raw_text = _as_text(raw_text)
+    if not raw_text or not raw_text.strip():
+        return "No diary content provided for this day."
+    
+    prompt = _build_narrative_prompt(raw_text, mood, conflict_data)
+
     cache_key = f"narrative_{hash(prompt)}"
-    cached = director_engine.cache.get(cache_key)
+    semantic_context = _semantic_context(raw_text, mood, conflict_data)
+    cached = director_engine.cache.get(cache_key) or semantic_cache.lookup(raw_text, semantic_context)
     if cached:
         return cached
 
-    # 4. Request from LLM
-    import time
-    start = time.time()
-    result = _make_request(prompt)
-    duration = time.time() - start
+    start = time.perf_counter()
+    result = await _make_request_async(prompt, num_predict=256)
+    duration = time.perf_counter() - start
     director_engine.perf_logger.log_event("generate_narrative", duration)
     
+    return _finish_narrative(raw_text, result, cache_key, semantic_context)
+
+
+def generate_narrative_and_title(raw_text: str, mood: Optional[str] = None, conflict_data: Optional[ConflictAnalysis] = None,
+                                 use_cache: bool = True) -> Tuple[str, str]:
+    """
+    Generate the narrative and episode title in a single Ollama request.
+    
+    Uses Ollama's JSON output mode so both fields come back from one
+    generation, halving round trips and prompt evaluation compared to
+    calling generate_narrative and generate_title separately.
+    
+    Args:
+        raw_text: The user's raw diary entry text
+        mood: Optional mood to guide the cinematic style
+        conflict_data: Optional ConflictAnalysis to drive the narrative structure
+        use_cache: If False, skip cached results and generate fresh ones
+        
+    Returns:
+        Tuple of (narrative, title)
+    """
+    raw_text = _as_text(raw_text)
+    if not raw_text or not raw_text.strip():
+        return "No diary content provided for this day.", "Untitled Episode"
+    
+    prompt = _build_narrative_prompt(raw_text, mood, conflict_data, suffix=_NARRATIVE_TITLE_SUFFIX)
+
+    cache_key = f"narrative_title_{hash(prompt)}"
+    if use_cache:
+        cached = director_engine.cache.get(cache_key)
+        if cached:
+            return cached
+
+    start = time.perf_counter()
+    result = _make_request(prompt, format="json", num_predict=320, use_cache=use_cache)
+    duration = time.perf_counter() - start
+    director_engine.perf_logger.log_event("generate_narrative_and_title", duration)
+    
+    data = extract_json(result, "{") if result else None
+    if not isinstance(data, dict):
+        data = {}
+    narrative = str(data.get("narrative") or "").strip()
+    title = _clean_title(str(data.get("title") or ""))
+    
+    if not narrative:
+        return _finish_narrative(raw_text, None, cache_key), title
+    
+    final_narrative = style_guide.add_sensory_layer(narrative)
+    director_engine.cache.set(cache_key, (final_narrative, title))
+    return final_narrative, title
+
+
+def _build_narrative_prompt(raw_text: str, mood: Optional[str], conflict_data: Optional[ConflictAnalysis],
+                            suffix: str = _NARRATIVE_SUFFIX) -> str:
+    """Build the style-enhanced narrative prompt for a diary entry."""
+    # 1. Detect mood if not explicitly provided (explicit moods skip the keyword scan)
+    if not mood:
+        mood = detect_mood(raw_text)
+    
+    # 2. Prepare the base prompt, incorporating conflict data
+    base_prompt = "".join((
+        _NARRATIVE_HEAD, _conflict_context(conflict_data), _NARRATIVE_MID,
+        _truncate_tokens(raw_text, _ENTRY_TOKEN_BUDGET)
+    ))
+
+    # 3. Enhance the prompt with cinematic instructions
+    prompt = style_guide.enhance_prompt(base_prompt, mood)
+    return prompt + suffix
+
+
+def _conflict_context(conflict_data: Optional[ConflictAnalysis]) -> str:
+    """Render conflict data as the prompt lines that drive the narrative."""
+    if not conflict_data:
+        return ""
+    conflict_context = f"\nCentral Conflict: {conflict_data.central_conflict}"
+    if conflict_data.internal_conflicts:
+        conflict_context += f"\nInternal Struggles: {', '.join(conflict_data.internal_conflicts)}"
+    if conflict_data.external_conflicts:
+        conflict_context += f"\nExternal Obstacles: {', '.join(conflict_data.external_conflicts)}"
+    conflict_context += f"\nTension Level: {conflict_data.tension_level}/10"
+    return conflict_context
+
+
+def _semantic_context(raw_text: str, mood: Optional[str], conflict_data: Optional[ConflictAnalysis]) -> str:
+    """Semantic cache context: the prompt inputs other than the diary text."""
+    return (mood or detect_mood(raw_text)) + _conflict_context(conflict_data)
+
+
+def _finish_narrative(raw_text: str, result: Optional[str], cache_key: str,
+                      semantic_context: str = "") -> str:
+    """Post-process an LLM narrative response, or build the offline fallback."""
     if result:
         # 5. Enrich the output with sensory layers
         final_narrative = style_guide.add_sensory_layer(result)
         director_engine.cache.set(cache_key, final_narrative)
+        semantic_cache.add(raw_text, final_narrative, semantic_context)
         return final_narrative
     
-    # Fallback when Ollama is not available
+    # Fallback when Ollama is not available; returned as-is so the offline
+    # state isn't dressed up with sensory details
     logger.info("Using fallback narrative (Ollama offline)")
-    fallback = f"[Demo narrative] {raw_text[:200]}{'...' if len(raw_text) > 200 else ''}"
-    return style_guide.add_sensory_layer(fallback)
+    return f"[Demo narrative] {raw_text[:200]}{'...' if len(raw_text) > 200 else ''}"
 
 
-def generate_title_options(text: str) -> List[Dict]:
+def _normalize_title_options(options: List) -> Tuple[List[Dict], int]:
+    """
+    Validate raw title options and pick the best one in the same pass.
+    
+    Returns:
+        Tuple of (valid_options, best_idx); best_idx is -1 if nothing was valid.
+    """
+    valid_options = []
+    best_idx, best_score = -1, float("-inf")
+    for opt in options:
+        if isinstance(opt, dict) and "title" in opt:
+            score = float(opt.get("score", 0.5))
+            if score > best_score:
+                best_idx, best_score = len(valid_options), score
+            valid_options.append({
+                "title": str(opt.get("title")).strip().strip('"\''),
+                "pattern": str(opt.get("pattern", "Unknown")),
+                "score": score
+            })
+    return valid_options, best_idx
+
+
+def generate_title_options(text: str, use_cache: bool = True) -> Tuple[List[Dict], int]:
     """
     Generate 5 title options using different patterns and scoring.
+    
+    Args:
+        text: Source text to title
+        use_cache: If False, skip cached responses and generate fresh options
+        
+    Returns:
+        Tuple of (options, best_idx) where best_idx points at the highest scoring option.
     """
     if not text or not text.strip():
-        return [{"title": "Untitled Episode", "score": 1.0, "pattern": "Default"}]
+        return [{"title": "Untitled Episode", "score": 1.0, "pattern": "Default"}], 0
     
-    prompt = f"""You are creating episode titles for a personal life documentary series.
-Analyze the following diary content and generate 5 title options using these patterns:
-1. 'The One Where...' (Friends style)
-2. Single evocative word ('Pilot', 'Crossroads', 'Aftermath')
-3. Song, book, or movie reference relevant to content
-4. Metaphorical title
-5. Direct dramatic statement
-
-For each title, provide a 'relevance_score' (0.0 to 1.0) based on how well it matches keywords and mood.
-Output the result as a raw JSON list of objects with 'title', 'pattern', and 'score' keys.
-Do not include any other text, only the JSON.
+    prompt = _TITLE_OPTIONS_PROMPT.substitute(text=_truncate_tokens(text, 200))
 
-Example:
-[
-  {{"title": "The One Where Dreams Collide", "pattern": "Friends-style", "score": 0.85}},
-  {{"title": "Crossroads", "pattern": "Single-word", "score": 0.92}}
-]
-
-Diary content:
-{text[:800]}
-
-JSON Output:"""
-
-    result = _make_request(prompt, timeout=40)
+    result = _make_request(prompt, timeout=40, num_predict=256, use_cache=use_cache)
     
     if result:
         try:
             # Try to find JSON in the response if it's not raw
-            import json
-            import re
-            json_match = re.search(r'\[.*\]', result, re.DOTALL)
-            if json_match:
-                options = json.loads(json_match.group(0))
+            options = extract_json(result, "[")
+            if options:
                 # Normalize and validate
-                valid_options = []
-                for opt in options:
-                    if isinstance(opt, dict) and "title" in opt:
-                        valid_options.append({
-                            "title": str(opt.get("title")).strip().strip('"\''),
-                            "pattern": str(opt.get("pattern", "Unknown")),
-                            "score": float(opt.get("score", 0.5))
-                        })
+                valid_options, best_idx = _normalize_title_options(options)
                 if valid_options:
-                    return valid_options
+                    return valid_options, best_idx
         except Exception as e:
-            logging.error(f"Failed to parse title options JSON: {e}")
+            logger.error("Failed to parse title options JSON: %s", e)
 
     # Fallback to single generation or dummy options
-    title = generate_title(text) # Use the old one as fallback
-    return [{"title": title, "pattern": "Direct", "score": 0.5}]
+    title = generate_title(text, use_cache) # Use the old one as fallback
+    return [{"title": title, "pattern": "Direct", "score": 0.5}], 0
 
 
-def generate_title(text: str) -> str:
+def generate_title(text: str, use_cache: bool = True) -> str:
     """
     Generate a catchy episode title from diary text.
     """
     if not text or not text.strip():
         return "Untitled Episode"
     
-    prompt = f"""You are creating episode titles for a personal life documentary series.
+    result = _make_request(_build_title_prompt(text), timeout=30, format=_TITLE_SCHEMA, num_predict=48,
+                           use_cache=use_cache)
+    return _parse_title(result)
 
-Generate a single catchy, evocative episode title (3-7 words) for this diary entry.
-The title should feel like a TV episode title - intriguing, memorable, and capturing the essence of the day.
-Only output the title, nothing else. No quotes, no explanation.
 
-Diary content:
-{text[:500]}
+async def agenerate_title(text: str) -> str:
+    """
+    Async version of generate_title using the shared async HTTP client.
+    """
+    if not text or not text.strip():
+        return "Untitled Episode"
+    
+    result = await _make_request_async(_build_title_prompt(text), timeout=30, format=_TITLE_SCHEMA, num_predict=48)
+    return _parse_title(result)
 
-Episode title:"""
 
-    result = _make_request(prompt, timeout=30)
-    
+def _build_title_prompt(text: str) -> str:
+    """Build the single-title generation prompt."""
+    return _TITLE_PROMPT.substitute(text=_truncate_tokens(text, 125))
+
+
+def _parse_title(result: Optional[str]) -> str:
+    """Read the title from a structured-output response."""
+    data = extract_json(result, "{") if result else None
+    if isinstance(data, dict):
+        title = str(data.get("title") or "").strip()
+        if title:
+            return title
+        return "Untitled Episode"
+    # Servers without structured outputs may still answer in plain text
+    return _clean_title(result)
+
+
+def _clean_title(result: Optional[str]) -> str:
+    """Strip quotes and cap the length of a generated title."""
     if result:
         title = result.strip().strip('"\'').strip()
         words = title.split()
@@ -200,39 +603,22 @@ Episode title:"""
     return "Untitled Episode"
     
     
-def generate_synopsis(text: str) -> Dict[str, any]:
+def generate_synopsis(text: str, use_cache: bool = True) -> Dict[str, any]:
     """
     Generate a logline, synopsis, and keywords for an episode.
     """
     if not text or not text.strip():
         return {"logline": "", "synopsis": "", "keywords": []}
         
-    prompt = f"""You are an expert TV writer and metadata specialist.
-Analyze the following episode narrative and extract the following:
-1. LOGLINE: Exactly one sentence hook (max 15 words) with intrigue, no spoilers. 
-   Example: 'A critical deadline forces an unexpected alliance with an old rival.'
-2. SYNOPSIS: A 2-3 sentence summary for an episode listing.
-3. KEYWORDS: Exactly 5 searchable/filterable tags that capture themes or events.
-
-Output the result as a raw JSON object with 'logline', 'synopsis', and 'keywords' (list) keys.
-Do not include any other text, only the JSON.
+    prompt = _SYNOPSIS_PROMPT.substitute(text=_truncate_tokens(text, 375))
 
-Episode Narrative:
-{text[:1500]}
-
-JSON Output:"""
-
-    result = _make_request(prompt, timeout=40)
+    result = _make_request(prompt, timeout=40, num_predict=256, use_cache=use_cache)
     
     if result:
         try:
-            import json
-            import re
             # Extract JSON from the response
-            json_match = re.search(r'\{.*\}', result, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group(0))
-                
+            data = extract_json(result, "{")
+            if data:
                 # Extract and clean fields
                 logline = str(data.get("logline", "")).strip()
                 synopsis = str(data.get("synopsis", "")).strip()
@@ -254,12 +640,12 @@ JSON Output:"""
                     "keywords": keywords
                 }
         except Exception as e:
-            logging.error(f"Failed to parse synopsis JSON: {e}")
+            logger.error("Failed to parse synopsis JSON: %s", e)
 
     return {"logline": "", "synopsis": "", "keywords": []}
 
 
-def ensure_narrative(entry) -> None:
+def ensure_narrative(entry, use_cache: bool = True) -> None:
     """
     Ensure an entry has narrative_text, generating if needed.
     
@@ -268,9 +654,33 @@ def ensure_narrative(entry) -> None:
     
     Args:
         entry: Entry object to update (modified in place)
+        use_cache: If False, generate fresh text instead of reusing cached responses
     """
     if not entry.narrative_text:
-        entry.narrative_text = generate_narrative(entry.raw_text, conflict_data=entry.conflict_data)
+        entry.narrative_text = generate_narrative(entry.raw_text, conflict_data=entry.conflict_data,
+                                                  use_cache=use_cache)
+
+
+def ensure_narrative_and_title(entry, use_cache: bool = True) -> None:
+    """
+    Ensure an entry has narrative_text and a title, using one fused request
+    when both are missing.
+    
+    Args:
+        entry: Entry object to update (modified in place)
+        use_cache: If False, generate fresh text instead of reusing cached responses
+    """
+    if entry.narrative_text and entry.title:
+        return
+    if entry.narrative_text or entry.title:
+        ensure_narrative(entry, use_cache)
+        ensure_title(entry, use_cache=use_cache)
+        return
+    entry.narrative_text, entry.title = generate_narrative_and_title(
+        entry.raw_text, conflict_data=entry.conflict_data, use_cache=use_cache
+    )
+    # Keep title_options consistent with the single fused title
+    entry.title_options = [{"title": entry.title, "pattern": "Direct", "score": 0.5}] if entry.title else []
 
 
 def ensure_conflict_analysis(entry) -> None:
@@ -284,33 +694,42 @@ def ensure_conflict_analysis(entry) -> None:
         entry.conflict_data = conflict_detector.analyze_entry(entry.raw_text)
 
 
-def ensure_title(entry) -> None:
+def ensure_title(entry, text: Optional[str] = None, use_cache: bool = True) -> None:
     """
     Ensure an entry has a title and title options, generating if needed.
+    
+    Args:
+        entry: Entry object to update (modified in place)
+        text: Source text to title; defaults to the narrative or raw text
+        use_cache: If False, generate fresh options instead of reusing cached responses
     """
     if not entry.title or not entry.title_options:
-        text = entry.narrative_text or entry.raw_text
-        options = generate_title_options(text)
+        text = text or entry.narrative_text or entry.raw_text
+        options, best_idx = generate_title_options(text, use_cache)
         entry.title_options = options
         if options and not entry.title:
             # Pick the highest scoring one
-            best_opt = max(options, key=lambda x: x.get('score', 0))
-            entry.title = best_opt['title']
+            entry.title = options[best_idx]['title']
 
 
-def ensure_synopsis(entry) -> None:
+def ensure_synopsis(entry, text: Optional[str] = None, use_cache: bool = True) -> None:
     """
     Ensure an entry has synopsis data.
+    
+    Args:
+        entry: Entry object to update (modified in place)
+        text: Source text to summarize; defaults to the narrative or raw text
+        use_cache: If False, generate fresh data instead of reusing cached responses
     """
     if not entry.logline or not entry.synopsis or not entry.keywords:
-        text = entry.narrative_text or entry.raw_text
-        data = generate_synopsis(text)
+        text = text or entry.narrative_text or entry.raw_text
+        data = generate_synopsis(text, use_cache)
         entry.logline = data.get("logline")
         entry.synopsis = data.get("synopsis")
         entry.keywords = data.get("keywords", [])
 
 
-def process_entry(entry, force: bool = False) -> None:
+def process_entry(entry, force: bool = False, use_cache: bool = True) -> None:
     """
     Fully process an entry: generate narrative, title, and synopsis.
     
@@ -319,8 +738,10 @@ def process_entry(entry, force: bool = False) -> None:
     
     Args:
         entry: Entry object to process (modified in place)
-        force: If True, regenerates even if data exists
+        force: If True, regenerates even if data exists (implies use_cache=False)
+        use_cache: If False, generate fresh text instead of reusing cached responses
     """
+    use_cache = use_cache and not force
     # If all or most are missing, use the optimized full generation
     # Otherwise, use sequential 'ensure' calls to fill gaps.
     is_missing_all = (force or 
@@ -329,23 +750,113 @@ def process_entry(entry, force: bool = False) -> None:
     
     if is_missing_all:
         try:
-            _process_entry_full(entry)
+            _process_entry_full(entry, use_cache)
             return
         except Exception as e:
-            logging.warning(f"Optimized processing failed for entry {entry.id}: {e}. Falling back to sequential.")
+            logger.warning("Optimized processing failed for entry %s: %s. Falling back to sequential.", entry.id, e)
 
     # Sequential fallback / Partial update
     ensure_conflict_analysis(entry)
-    ensure_narrative(entry)
-    ensure_title(entry)
-    ensure_synopsis(entry)
+    
+    # Once conflict data exists, narrative, title and synopsis are independent,
+    # so their Ollama requests can overlap. The source text is fixed up front
+    # so title/synopsis don't race with the narrative being written.
+    text = entry.narrative_text or entry.raw_text
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        if not entry.narrative_text and not entry.title:
+            # One fused generation instead of two separate requests
+            futures = [executor.submit(ensure_narrative_and_title, entry, use_cache)]
+        else:
+            futures = [
+                executor.submit(ensure_narrative, entry, use_cache),
+                executor.submit(ensure_title, entry, text, use_cache),
+            ]
+        futures.append(executor.submit(ensure_synopsis, entry, text, use_cache))
+        for future in futures:
+            future.result()
+
+
+def iter_process_entries(entries: List, force: bool = False,
+                         max_workers: Optional[int] = None) -> Iterator[Tuple[object, Optional[Exception]]]:
+    """
+    Process many entries in parallel threads, yielding each as it finishes.
+    
+    HTTP clients release the GIL while waiting on Ollama, so threads overlap
+    the network/generation wait. Ollama only generates in parallel up to its
+    OLLAMA_NUM_PARALLEL setting, which is the default worker count here.
+    Work starts on the first next(); use process_entries to run eagerly.
+    
+    Args:
+        entries: Entry objects to process (modified in place)
+        force: Regenerate content even if it already exists
+        max_workers: Maximum entries in flight (default: OLLAMA_NUM_PARALLEL)
+        
+    Yields:
+        (entry, error) tuples in completion order; error is the exception
+        raised while processing that entry, or None on success
+    """
+    if not entries:
+        return
+    workers = max(1, min(len(entries), max_workers or OLLAMA_NUM_PARALLEL))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(process_entry, entry, force): entry for entry in entries}
+        for future in as_completed(futures):
+            yield futures[future], future.exception()
 
 
-def _process_entry_full(entry) -> None:
-    """Internal optimized processing using a single large prompt."""
-    import json
-    import re
+def process_entries(entries: List, force: bool = False,
+                    max_workers: Optional[int] = None) -> List[Tuple[object, Optional[Exception]]]:
+    """
+    Process many entries in parallel threads and wait for all of them.
+    
+    Args:
+        entries: Entry objects to process (modified in place)
+        force: Regenerate content even if it already exists
+        max_workers: Maximum entries in flight (default: OLLAMA_NUM_PARALLEL)
+        
+    Returns:
+        (entry, error) tuples in completion order; error is the exception
+        raised while processing that entry, or None on success
+    """
+    return list(iter_process_entries(entries, force, max_workers))
+
+
+async def aprocess_entry(entry) -> None:
+    """
+    Async processing for a single entry: generate narrative, then title.
     
+    Args:
+        entry: Entry object to process (modified in place)
+    """
+    if not entry.narrative_text:
+        entry.narrative_text = await agenerate_narrative(entry.raw_text, conflict_data=entry.conflict_data)
+    if not entry.title:
+        entry.title = await agenerate_title(entry.narrative_text or entry.raw_text)
+
+
+async def aprocess_entries(entries: List, concurrency: int = 8) -> None:
+    """
+    Process many entries concurrently against Ollama.
+    
+    Requests overlap up to `concurrency` at a time. Ollama only generates
+    in parallel when started with OLLAMA_NUM_PARALLEL > 1; otherwise
+    requests queue on the server but still share warm connections.
+    
+    Args:
+        entries: Entry objects to process (modified in place)
+        concurrency: Maximum number of entries in flight at once
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _one(entry) -> None:
+        async with semaphore:
+            await aprocess_entry(entry)
+
+    await asyncio.gather(*(_one(entry) for entry in entries))
+
+
+def _process_entry_full(entry, use_cache: bool = True) -> None:
+    """Internal optimized processing using a single large prompt."""
     mood = detect_mood(entry.raw_text)
     
     prompt = f"""You are an expert TV writer and metadata specialist.
@@ -357,7 +868,7 @@ Analyze the following diary entry and produce a complete episode package.
 4. METADATA: Provide a 1-sentence logline, a 2-3 sentence synopsis, and exactly 5 keywords.
 
 Diary entry:
-{entry.raw_text}
+{_truncate_tokens(entry.raw_text, _ENTRY_TOKEN_BUDGET)}
 
 IMPORTANT: Output ONLY a raw JSON object with these keys: 
 'conflict' (object with internal_conflicts, external_conflicts, tension_level, archetype, central_conflict),
@@ -371,26 +882,23 @@ IMPORTANT: Output ONLY a raw JSON object with these keys:
     
     # Check cache
     cache_key = f"full_process_{hash(enhanced_prompt)}"
-    cached = director_engine.cache.get(cache_key)
+    cached = director_engine.cache.get(cache_key) if use_cache else None
     if cached:
         # Populate entry from cached data
         data = cached
         _populate_entry_from_data(entry, data)
         return
 
-    import time
-    start = time.time()
-    result = _make_request(enhanced_prompt, timeout=90)
-    duration = time.time() - start
+    start = time.perf_counter()
+    result = _make_request(enhanced_prompt, timeout=90, use_cache=use_cache)
+    duration = time.perf_counter() - start
     director_engine.perf_logger.log_event("full_process", duration)
     
     if result:
         try:
             # Extract and parse JSON
-            json_match = re.search(r'\{.*\}', result, re.DOTALL)
-            if json_match:
-                data = json.loads(json_match.group(0))
-                
+            data = extract_json(result, "{")
+            if data:
                 # 1. Conflict
                 c_data = data.get('conflict', {})
                 entry.conflict_data = ConflictAnalysis(
@@ -407,11 +915,10 @@ IMPORTANT: Output ONLY a raw JSON object with these keys:
                     entry.narrative_text = style_guide.add_sensory_layer(narrative)
                 
                 # 3. Titles
-                titles = data.get('titles', [])
+                titles, best_idx = _normalize_title_options(data.get('titles', []))
                 if titles:
                     entry.title_options = titles
-                    best_opt = max(titles, key=lambda x: x.get('score', 0))
-                    entry.title = best_opt.get('title')
+                    entry.title = titles[best_idx]['title']
                 
                 # 4. Metadata
                 meta = data.get('metadata', {})
@@ -448,11 +955,10 @@ def _populate_entry_from_data(entry, data: Dict) -> None:
         entry.narrative_text = style_guide.add_sensory_layer(narrative)
     
     # 3. Titles
-    titles = data.get('titles', [])
+    titles, best_idx = _normalize_title_options(data.get('titles', []))
     if titles:
         entry.title_options = titles
-        best_opt = max(titles, key=lambda x: x.get('score', 0))
-        entry.title = best_opt.get('title')
+        entry.title = titles[best_idx]['title']
     
     # 4. Metadata
     meta = data.get('metadata', {})
@@ -5,9 +5,17 @@ Low-level Ollama API integration and configuration.
 """
 
 import os
+import atexit
+import asyncio
 import logging
 import json
-from typing import Optional
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, List, Optional
 
 try:
     import httpx
@@ -17,60 +25,461 @@ except ImportError:
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 
 # Configuration via environment variables
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "llama3.2")
 OLLAMA_TIMEOUT = int(os.getenv("OLLAMA_TIMEOUT", "60"))
+# Requests the Ollama server generates concurrently (mirror the server's setting)
+OLLAMA_NUM_PARALLEL = int(os.getenv("OLLAMA_NUM_PARALLEL", "4"))
+# How long Ollama keeps the model loaded after a request (avoids reload latency)
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "30m")
+# Retries for failed connection attempts only; a request that reached the
+# server is never resent, so a generation is not run twice
+OLLAMA_CONNECT_RETRIES = int(os.getenv("OLLAMA_CONNECT_RETRIES", "2"))
+OLLAMA_CACHE_SIZE = int(os.getenv("OLLAMA_CACHE_SIZE", "1024"))
+# Path to a sqlite file for persisting responses across runs (unset = memory only)
+OLLAMA_CACHE_DB = os.getenv("OLLAMA_CACHE_DB")
 
 # Logging setup
 logger = logging.getLogger(__name__)
 
 
+# Shared decoder used to locate JSON embedded in free-form LLM output
+_JSON_DECODER = json.JSONDecoder()
+
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize a request body, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _loads(data: bytes) -> Any:
+    """Parse a response body, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data)
+
+# Requests currently in flight, keyed by their serialized payload, so
+# duplicate concurrent prompts share one Ollama generation
+_INFLIGHT: Dict[str, Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+# Async counterpart; each future belongs to the event loop that created it
+_ASYNC_INFLIGHT: Dict[str, asyncio.Future] = {}
+
+# Shared async client, bound to the event loop it was created in
+_async_client = None
+_async_client_loop = None
+
+
 class OllamaError(Exception):
     """Custom exception for Ollama-related errors."""
     pass
 
 
-def _make_request(prompt: str, timeout: int = OLLAMA_TIMEOUT) -> Optional[str]:
+class OllamaClient:
     """
-    Make a request to Ollama API.
+    Pooled, keep-alive HTTP client for the Ollama API.
+    
+    Reusing one client keeps TCP connections open between calls instead of
+    paying a new handshake per request. Uses httpx when installed and falls
+    back to a requests.Session.
+    """
+    
+    def __init__(self, base_url: str = OLLAMA_BASE_URL, timeout: int = OLLAMA_TIMEOUT):
+        self.base_url = base_url
+        self.timeout = timeout
+        # Backend is chosen once here; post/get dispatch through the bound methods
+        if HTTPX_AVAILABLE:
+            self._client = httpx.Client(
+                timeout=timeout,
+                transport=httpx.HTTPTransport(
+                    limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                    retries=OLLAMA_CONNECT_RETRIES
+                )
+            )
+            self._body_arg = "content"
+        elif REQUESTS_AVAILABLE:
+            self._client = requests.Session()
+            retry = Retry(
+                total=OLLAMA_CONNECT_RETRIES, read=False, status=False, redirect=False,
+                backoff_factor=0.2
+            )
+            adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retry)
+            self._client.mount("http://", adapter)
+            self._client.mount("https://", adapter)
+            self._body_arg = "data"
+        else:
+            self._client = None
+            self._body_arg = None
+        self._post = self._client.post if self._client is not None else None
+        self._get = self._client.get if self._client is not None else None
+    
+    @property
+    def available(self) -> bool:
+        """Whether an HTTP library is installed to talk to Ollama."""
+        return self._client is not None
+    
+    def post(self, path: str, payload: Dict, timeout: Optional[int] = None):
+        """POST a JSON payload to an Ollama endpoint and return the response."""
+        # Pre-encoded body: httpx takes it as content=, requests as data=
+        return self._post(
+            f"{self.base_url}{path}", headers=_JSON_HEADERS, timeout=timeout or self.timeout,
+            **{self._body_arg: _dumps(payload)}
+        )
+    
+    def get(self, path: str, timeout: Optional[int] = None):
+        """GET an Ollama endpoint and return the response."""
+        return self._get(f"{self.base_url}{path}", timeout=timeout or self.timeout)
+    
+    def close(self) -> None:
+        """Close pooled connections."""
+        if self._client is not None:
+            self._client.close()
+    
+    def __enter__(self) -> "OllamaClient":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+# Shared client used by all sync requests in the process
+_CLIENT = OllamaClient()
+atexit.register(_CLIENT.close)
+
+
+class ResponseCache:
+    """
+    Exact-match cache of Ollama responses keyed on the request payload.
+    
+    Keeps an in-process LRU and, when a database path is given, a sqlite
+    table so responses survive restarts. Only successful responses are stored.
+    """
+    
+    def __init__(self, maxsize: int = OLLAMA_CACHE_SIZE, db_path: Optional[str] = None):
+        self.maxsize = maxsize
+        self._memory: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn = None
+        if db_path:
+            try:
+                os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+                self._conn = sqlite3.connect(db_path, check_same_thread=False)
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS responses "
+                    "(key TEXT PRIMARY KEY, response TEXT NOT NULL, ts INTEGER NOT NULL)"
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.warning("Response cache database unavailable (%s): %s", db_path, e)
+                self._conn = None
+    
+    @staticmethod
+    def make_key(payload: Dict[str, Any]) -> str:
+        """Stable digest of a request payload (model, prompt and options)."""
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                return value
+            if self._conn is None:
+                return None
+            row = self._conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._remember(key, row[0])
+            return row[0]
+    
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._remember(key, value)
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, ts) VALUES (?, ?, ?)",
+                    (key, value, int(time.time()))
+                )
+                self._conn.commit()
+    
+    def _remember(self, key: str, value: str) -> None:
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+    
+    def clear(self) -> None:
+        """Drop all cached responses, including persisted ones."""
+        with self._lock:
+            self._memory.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM responses")
+                self._conn.commit()
+    
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Shared response cache consulted before every generate request
+_RESPONSE_CACHE = ResponseCache(OLLAMA_CACHE_SIZE, OLLAMA_CACHE_DB)
+atexit.register(_RESPONSE_CACHE.close)
+
+
+def clear_response_cache() -> None:
+    """Clear cached Ollama responses (e.g. after changing models or prompts)."""
+    _RESPONSE_CACHE.clear()
+
+
+def extract_json(text: str, opener: str = "{") -> Optional[Any]:
+    """
+    Extract the first JSON value starting with `opener` from LLM output.
+    
+    Scans for the opening bracket and lets the JSON decoder find where the
+    value ends, so surrounding chatter or a second JSON snippet is ignored.
     
     Args:
-        prompt: The prompt to send to the model
-        timeout: Request timeout in seconds
+        text: Raw LLM response text
+        opener: "{" for an object or "[" for a list
         
     Returns:
-        Generated text response or None if failed
+        The decoded value, or None if no valid JSON was found
     """
-    url = f"{OLLAMA_BASE_URL}/api/generate"
+    if not text:
+        return None
+    start = text.find(opener)
+    while start != -1:
+        try:
+            value, _ = _JSON_DECODER.raw_decode(text, start)
+            return value
+        except ValueError:
+            start = text.find(opener, start + 1)
+    return None
+
+
+def _build_payload(prompt: str, format: Optional[Any] = None, num_predict: Optional[int] = None,
+                   stop: Optional[List[str]] = None) -> Dict[str, Any]:
+    """Build the /api/generate request body."""
     payload = {
         "model": OLLAMA_MODEL,
         "prompt": prompt,
-        "stream": False
+        "stream": False,
+        "keep_alive": OLLAMA_KEEP_ALIVE
     }
+    if format is not None:
+        payload["format"] = format
+    options = {}
+    if num_predict is not None:
+        options["num_predict"] = num_predict
+    if stop:
+        options["stop"] = stop
+    if options:
+        payload["options"] = options
+    return payload
+
+
+def _make_request(prompt: str, timeout: int = OLLAMA_TIMEOUT, format: Optional[Any] = None,
+                  num_predict: Optional[int] = None, stop: Optional[List[str]] = None,
+                  use_cache: bool = True) -> Optional[str]:
+    """
+    Make a request to Ollama API.
+    
+    Responses are served from the exact-match response cache when possible.
+    Identical prompts issued concurrently from several threads are coalesced:
+    the first caller performs the request and the others wait for its result.
+    
+    Args:
+        prompt: The prompt to send to the model
+        timeout: Request timeout in seconds
+        format: Optional Ollama output format ("json" or a JSON schema dict)
+        num_predict: Optional cap on generated tokens, sized to the task
+        stop: Optional stop sequences that end generation early
+        use_cache: If False, always generate a fresh response (the result
+            still replaces the cached one)
+        
+    Returns:
+        Generated text response or None if failed
+    """
+    payload = _build_payload(prompt, format, num_predict, stop)
+    key = ResponseCache.make_key(payload)
+    if not use_cache:
+        result = _post_generate(payload, timeout)
+        if result:
+            _RESPONSE_CACHE.set(key, result)
+        return result
+
+    cached = _RESPONSE_CACHE.get(key)
+    if cached is not None:
+        return cached
+    
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(key)
+        is_leader = future is None
+        if is_leader:
+            future = Future()
+            _INFLIGHT[key] = future
+    
+    if not is_leader:
+        return future.result()
     
     try:
-        if HTTPX_AVAILABLE:
-            with httpx.Client(timeout=timeout) as client:
-                response = client.post(url, json=payload)
-                response.raise_for_status()
-                data = response.json()
-                return data.get("response", "").strip()
-        elif REQUESTS_AVAILABLE:
-            response = requests.post(url, json=payload, timeout=timeout)
-            response.raise_for_status()
-            data = response.json()
-            return data.get("response", "").strip()
-        else:
-            logger.warning("Neither httpx nor requests library available")
-            return None
+        result = _post_generate(payload, timeout)
+        if result:
+            _RESPONSE_CACHE.set(key, result)
+        future.set_result(result)
+        return result
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    finally:
+        with _INFLIGHT_LOCK:
+            _INFLIGHT.pop(key, None)
+
+
+def _post_generate(payload: Dict[str, Any], timeout: int) -> Optional[str]:
+    """Send a single generate request to Ollama (no coalescing)."""
+    if not _CLIENT.available:
+        logger.warning("Neither httpx nor requests library available")
+        return None
+    
+    try:
+        response = _CLIENT.post("/api/generate", payload, timeout=timeout)
+        response.raise_for_status()
+        data = _loads(response.content)
+        return data.get("response", "").strip()
     except Exception as e:
-        logger.warning(f"Ollama request failed: {e}")
+        logger.warning("Ollama request failed: %s", e)
+        return None
+
+
+async def get_async_client():
+    """
+    Return the shared httpx.AsyncClient for the running event loop.
+    
+    Async clients must be created inside a running loop, so the client is
+    built lazily and rebuilt if called from a different loop.
+    """
+    global _async_client, _async_client_loop
+    loop = asyncio.get_running_loop()
+    if _async_client is None or _async_client_loop is not loop:
+        _async_client = httpx.AsyncClient(
+            base_url=OLLAMA_BASE_URL,
+            timeout=OLLAMA_TIMEOUT,
+            transport=httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                retries=OLLAMA_CONNECT_RETRIES
+            )
+        )
+        _async_client_loop = loop
+    return _async_client
+
+
+async def aclose_async_client() -> None:
+    """Close the shared async client (call before the event loop shuts down)."""
+    global _async_client, _async_client_loop
+    if _async_client is not None:
+        await _async_client.aclose()
+    _async_client = None
+    _async_client_loop = None
+
+
+async def _make_request_async(prompt: str, timeout: int = OLLAMA_TIMEOUT, format: Optional[Any] = None,
+                              num_predict: Optional[int] = None, stop: Optional[List[str]] = None,
+                              use_cache: bool = True) -> Optional[str]:
+    """
+    Async version of _make_request using the shared keep-alive client.
+    
+    Identical prompts awaited concurrently on the same event loop are
+    coalesced: the first task performs the request and the others await it.
+    
+    Args:
+        prompt: The prompt to send to the model
+        timeout: Request timeout in seconds
+        format: Optional Ollama output format ("json" or a JSON schema dict)
+        num_predict: Optional cap on generated tokens, sized to the task
+        stop: Optional stop sequences that end generation early
+        use_cache: If False, always generate a fresh response (the result
+            still replaces the cached one)
+        
+    Returns:
+        Generated text response or None if failed
+    """
+    if not HTTPX_AVAILABLE:
+        logger.warning("httpx library is required for async Ollama requests")
+        return None
+    
+    payload = _build_payload(prompt, format, num_predict, stop)
+    key = ResponseCache.make_key(payload)
+    if not use_cache:
+        result = await _post_generate_async(payload, timeout)
+        if result:
+            _RESPONSE_CACHE.set(key, result)
+        return result
+
+    cached = _RESPONSE_CACHE.get(key)
+    if cached is not None:
+        return cached
+    
+    loop = asyncio.get_running_loop()
+    future = _ASYNC_INFLIGHT.get(key)
+    if future is not None and future.get_loop() is loop:
+        # shield: a cancelled waiter must not cancel the shared request
+        return await asyncio.shield(future)
+    
+    future = loop.create_future()
+    _ASYNC_INFLIGHT[key] = future
+    try:
+        result = await _post_generate_async(payload, timeout)
+        if result:
+            _RESPONSE_CACHE.set(key, result)
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except BaseException as e:
+        future.set_exception(e)
+        # The leader re-raises it; don't warn when no task was waiting
+        future.exception()
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        if _ASYNC_INFLIGHT.get(key) is future:
+            del _ASYNC_INFLIGHT[key]
+
+
+async def _post_generate_async(payload: Dict[str, Any], timeout: int) -> Optional[str]:
+    """Send a single generate request with the shared async client (no coalescing)."""
+    try:
+        client = await get_async_client()
+        response = await client.post(
+            "/api/generate", content=_dumps(payload), headers=_JSON_HEADERS, timeout=timeout
+        )
+        response.raise_for_status()
+        data = _loads(response.content)
+        return data.get("response", "").strip()
+    except Exception as e:
+        logger.warning("Ollama request failed: %s", e)
         return None
 
 
@@ -81,15 +490,32 @@ def is_ollama_available() -> bool:
     Returns:
         True if Ollama is available, False otherwise
     """
-    try:
-        url = f"{OLLAMA_BASE_URL}/api/tags"
-        if HTTPX_AVAILABLE:
-            with httpx.Client(timeout=5) as client:
-                response = client.get(url)
-                return response.status_code == 200
-        elif REQUESTS_AVAILABLE:
-            response = requests.get(url, timeout=5)
-            return response.status_code == 200
+    if not _CLIENT.available:
         return False
+    try:
+        response = _CLIENT.get("/api/tags", timeout=5)
+        return response.status_code == 200
     except Exception:
         return False
+
+
+def load_model(timeout: int = OLLAMA_TIMEOUT) -> bool:
+    """
+    Ask Ollama to load the configured model into memory without generating.
+    
+    Args:
+        timeout: Request timeout in seconds (model loads can take a while)
+        
+    Returns:
+        True if the model was loaded, False otherwise
+    """
+    if not _CLIENT.available:
+        return False
+    try:
+        response = _CLIENT.post(
+            "/api/generate", {"model": OLLAMA_MODEL, "keep_alive": OLLAMA_KEEP_ALIVE}, timeout=timeout
+        )
+        return response.status_code == 200
+    except Exception as e:
+        logger.warning("Failed to load Ollama model %s: %s", OLLAMA_MODEL, e)
+        return False
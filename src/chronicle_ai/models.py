@@ -4,13 +4,47 @@ Chronicle AI - Data Models
 Defines the Entry model and related data structures for diary entries.
 """
 
+import sys
 from dataclasses import dataclass, field
 from typing import Optional, List
 from datetime import date
 import json
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-@dataclass
+# __slots__ drops the per-instance __dict__ (smaller objects, faster
+# attribute access); dataclass(slots=True) is only available on 3.10+
+_DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+# Suffix marking truncated previews
+_ELLIPSIS = "..."
+
+
+def _today() -> str:
+    """Today's date as an ISO string (default for new entries and recaps)."""
+    return date.today().isoformat()
+
+
+def _json_dumps(obj) -> str:
+    """Serialize a stored JSON column, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj).decode("utf-8")
+    return json.dumps(obj)
+
+
+def _json_loads(raw: str):
+    """Parse a stored JSON column, using orjson when installed."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class SeasonArc:
     """
     Detailed narrative analysis of a season's arc.
@@ -46,7 +80,7 @@ class SeasonArc:
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Season:
     """
     Organizes episodes into distinct narrative arcs or time periods.
@@ -78,6 +112,7 @@ class Season:
     def from_dict(cls, data: dict) -> "Season":
         if not data:
             return cls()
+        arc_analysis = data.get("arc_analysis")
         return cls(
             id=data.get("id"),
             title=data.get("title", ""),
@@ -87,11 +122,11 @@ class Season:
             dominant_themes=data.get("dominant_themes", []),
             description=data.get("description", ""),
             mode=data.get("mode", "default"),
-            arc_analysis=SeasonArc.from_dict(data.get("arc_analysis")) if data.get("arc_analysis") else None
+            arc_analysis=SeasonArc.from_dict(arc_analysis) if arc_analysis else None
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ConflictAnalysis:
     """
     Metadata about conflicts found in a diary entry.
@@ -124,13 +159,91 @@ class ConflictAnalysis:
         )
 
 
-@dataclass
+class LazyConflictAnalysis(ConflictAnalysis):
+    """
+    ConflictAnalysis backed by its stored JSON, decoded on first field access.
+    
+    Listing entries then costs no JSON decode for rows whose conflict data is
+    never read. Relies on slotted dataclasses: unset slots raise
+    AttributeError, which routes the first access through __getattr__.
+    """
+    __slots__ = ("_raw",)
+    
+    def __init__(self, raw: Optional[str] = None, **fields):
+        # Keyword fields (as passed by dataclasses.replace) build a decoded instance
+        object.__setattr__(self, "_raw", None if fields else raw)
+        if fields or raw is None:
+            ConflictAnalysis.__init__(self, **fields)
+    
+    def _pending_raw(self) -> Optional[str]:
+        # Read the slot directly: copy/unpickle build instances via __new__,
+        # where going through __getattr__ would recurse
+        try:
+            return object.__getattribute__(self, "_raw")
+        except AttributeError:
+            return None
+    
+    def _load(self) -> None:
+        data = _json_loads(self._pending_raw()) or {}
+        object.__setattr__(self, "_raw", None)
+        ConflictAnalysis.__init__(
+            self,
+            internal_conflicts=data.get("internal_conflicts", []),
+            external_conflicts=data.get("external_conflicts", []),
+            tension_level=data.get("tension_level", 1),
+            archetype=data.get("archetype", "none"),
+            central_conflict=data.get("central_conflict", "")
+        )
+    
+    def __getattr__(self, name: str):
+        # Protocol probes (__deepcopy__, __getstate__, ...) are not fields
+        if name.startswith("__") or self._pending_raw() is None:
+            raise AttributeError(name)
+        self._load()
+        return getattr(self, name)
+    
+    def __setattr__(self, name: str, value) -> None:
+        # Decode first so later field reads don't overwrite this assignment
+        if self._pending_raw() is not None:
+            self._load()
+        object.__setattr__(self, name, value)
+    
+    def __reduce__(self):
+        # Copies and pickles stay lazy until decoded, then carry the fields
+        raw = self._pending_raw()
+        if raw is not None:
+            return (LazyConflictAnalysis, (raw,))
+        return (ConflictAnalysis.from_dict, (self.to_dict(),))
+    
+    def __eq__(self, other):
+        if isinstance(other, ConflictAnalysis):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+
+def load_conflict_analysis(raw: str) -> ConflictAnalysis:
+    """
+    Build a ConflictAnalysis from its stored JSON, lazily where supported.
+    
+    Args:
+        raw: JSON string as stored in the conflict_data column
+        
+    Returns:
+        ConflictAnalysis (decoded on first access on Python 3.10+)
+    """
+    if _DATACLASS_OPTIONS:
+        return LazyConflictAnalysis(raw)
+    # Without slots the class-level field defaults would shadow __getattr__
+    return ConflictAnalysis.from_dict(_json_loads(raw))
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class Recap:
     """
     Generated summary of previous episodes.
     """
     id: Optional[int] = None
-    date: str = field(default_factory=lambda: date.today().isoformat())
+    date: str = field(default_factory=_today)
     content: str = ""
     entry_ids: List[int] = field(default_factory=list)  # IDs of entries summarized
 
@@ -148,13 +261,13 @@ class Recap:
             return cls()
         return cls(
             id=data.get("id"),
-            date=data.get("date", date.today().isoformat()),
+            date=data["date"] if "date" in data else _today(),
             content=data.get("content", ""),
             entry_ids=data.get("entry_ids", [])
         )
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Entry:
     """
     Represents a single diary entry with optional AI-generated content.
@@ -167,7 +280,7 @@ class Entry:
         title: AI-generated episode title (optional)
     """
     id: Optional[int] = None
-    date: str = field(default_factory=lambda: date.today().isoformat())
+    date: str = field(default_factory=_today)
     raw_text: str = ""
     narrative_text: Optional[str] = None
     title: Optional[str] = None
@@ -201,9 +314,10 @@ class Entry:
     @classmethod
     def from_dict(cls, data: dict) -> "Entry":
         """Create an Entry from a dictionary."""
+        conflict_data = data.get("conflict_data")
         return cls(
             id=data.get("id"),
-            date=data.get("date", date.today().isoformat()),
+            date=data["date"] if "date" in data else _today(),
             raw_text=data.get("raw_text", ""),
             narrative_text=data.get("narrative_text"),
             title=data.get("title"),
@@ -211,7 +325,7 @@ class Entry:
             logline=data.get("logline"),
             synopsis=data.get("synopsis"),
             keywords=data.get("keywords", []),
-            conflict_data=ConflictAnalysis.from_dict(data.get("conflict_data")) if data.get("conflict_data") else None,
+            conflict_data=ConflictAnalysis.from_dict(conflict_data) if conflict_data else None,
             recap_id=data.get("recap_id"),
             season_id=data.get("season_id"),
             cover_art_path=data.get("cover_art_path")
@@ -222,7 +336,7 @@ class Entry:
         text = self.narrative_text or self.raw_text
         if len(text) <= max_length:
             return text
-        return text[:max_length - 3] + "..."
+        return text[:max_length - len(_ELLIPSIS)] + _ELLIPSIS
     
     def display_title(self) -> str:
         """Return title or a fallback display string."""
@@ -4,7 +4,87 @@ Chronicle AI - Text Processing Utility
 Provides functions for processing and segmenting raw diary text.
 """
 import re
-from typing import Dict
+from typing import Dict, Optional, Sequence, Tuple
+
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+
+class KeywordClassifier:
+    """
+    Single-pass substring classifier over priority-ordered keyword groups.
+    
+    Finds every keyword occurrence in one scan and returns the label of the
+    earliest group that matched, i.e. the same answer as checking each group
+    in order with `any(word in text for word in keywords)`. Uses a
+    pyahocorasick automaton when installed, otherwise a compiled regex.
+    """
+    
+    def __init__(self, groups: Sequence[Tuple[str, Sequence[str]]]):
+        """
+        Args:
+            groups: (label, keywords) pairs in priority order; keywords are lowercase
+        """
+        self._priority = {}
+        for priority, (label, keywords) in enumerate(groups):
+            for keyword in keywords:
+                self._priority.setdefault(keyword, (priority, label))
+        
+        if AHOCORASICK_AVAILABLE:
+            self._automaton = ahocorasick.Automaton()
+            for keyword, value in self._priority.items():
+                self._automaton.add_word(keyword, value)
+            self._automaton.make_automaton()
+            self._pattern = None
+        else:
+            self._automaton = None
+            # Zero-width lookahead so overlapping keywords are all seen; the
+            # alternation is in priority order so each position reports its best keyword
+            self._pattern = re.compile(
+                "(?=(" + "|".join(re.escape(k) for _, keywords in groups for k in keywords) + "))"
+            )
+    
+    def classify(self, lower_text: str) -> Optional[str]:
+        """
+        Return the highest-priority label whose keywords occur in the text.
+        
+        Args:
+            lower_text: Already-lowercased text to scan
+            
+        Returns:
+            The matching label, or None if no keyword occurs
+        """
+        if self._automaton is not None:
+            hits = (value for _, value in self._automaton.iter(lower_text))
+        else:
+            hits = (self._priority[m.group(1)] for m in self._pattern.finditer(lower_text))
+        best = None
+        for candidate in hits:
+            if best is None or candidate < best:
+                best = candidate
+                if best[0] == 0:
+                    break
+        return best[1] if best else None
+
+# Explicit segment markers at the start of a line, e.g. "Morning: ..."
+_MARKER_RE = re.compile(r"(morning|afternoon|night|evening):(.*)", re.IGNORECASE)
+_MARKER_KEYS = {"morning": "morning", "afternoon": "afternoon", "night": "night", "evening": "night"}
+# Cheap whole-text check; most entries have no markers and skip the line scan
+_MARKER_PROBE_RE = re.compile(r"(?:morning|afternoon|night|evening):")
+
+# Time-of-day keyword hints used when the text has no explicit markers
+_MORNING_HINTS = ("woke up", "breakfast", "8am", "9am", "10am", "morning")
+_AFTERNOON_HINTS = ("lunch", "1pm", "2pm", "afternoon")
+_NIGHT_HINTS = ("dinner", "night", "evening", "tonight", "bed")
+
+_TIME_HINTS = KeywordClassifier((
+    ("morning", _MORNING_HINTS),
+    ("afternoon", _AFTERNOON_HINTS),
+    ("night", _NIGHT_HINTS),
+))
 
 
 def segment_diary_text(raw_text: str) -> Dict[str, str]:
@@ -26,65 +106,59 @@ def segment_diary_text(raw_text: str) -> Dict[str, str]:
     if not raw_text or not raw_text.strip():
         return segments
     
-    # Normalize line endings
-    text = raw_text.replace('\r\n', '\n')
-    lines = text.splitlines()
+    # Lowercase once for the probe and hint matching
+    lowered = raw_text.lower()
     
     # 1. LOOK FOR EXPLICIT MARKERS (e.g., "Morning:", "Afternoon:")
-    current_key = None
-    segment_captured = {"morning": [], "afternoon": [], "night": [], "unassigned": []}
+    # Text before the first marker belongs to the morning
+    current_key = "morning"
+    segment_captured = {"morning": [], "afternoon": [], "night": []}
     found_markers = False
+    # splitlines() already understands \r\n, so markers need no normalization
+    lines = raw_text.splitlines() if _MARKER_PROBE_RE.search(lowered) else ()
     
     for line in lines:
         stripped = line.strip()
-        lower_line = stripped.lower()
-        
-        new_key = None
-        if lower_line.startswith("morning:"):
-            new_key = "morning"
-        elif lower_line.startswith("afternoon:"):
-            new_key = "afternoon"
-        elif lower_line.startswith("night:") or lower_line.startswith("evening:"):
-            new_key = "night"
+        marker = _MARKER_RE.match(stripped)
             
-        if new_key:
-            current_key = new_key
+        if marker:
+            current_key = _MARKER_KEYS[marker.group(1).lower()]
             found_markers = True
             # Keep the content after the colon if it exists on the same line
-            content = stripped.split(":", 1)[1].strip()
+            content = marker.group(2).strip()
             if content:
                 segment_captured[current_key].append(content)
-        elif current_key:
-            segment_captured[current_key].append(line)
         else:
-            segment_captured["unassigned"].append(line)
+            segment_captured[current_key].append(line)
             
     if found_markers:
-        segments["morning"] = "\n".join(segment_captured["unassigned"] + segment_captured["morning"]).strip()
+        segments["morning"] = "\n".join(segment_captured["morning"]).strip()
         segments["afternoon"] = "\n".join(segment_captured["afternoon"]).strip()
         segments["night"] = "\n".join(segment_captured["night"]).strip()
         return segments
 
     # 2. TIME-HINT BASED SEGMENTATION
     # If no explicit markers, look for time-of-day keywords within the text
-    paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
+    # Normalize line endings so paragraphs split and join on plain \n;
+    # lower() never adds or removes newlines, so both splits line up
+    text = raw_text.replace('\r\n', '\n')
+    lowered = lowered.replace('\r\n', '\n')
+    paragraphs = []
+    lowered_paragraphs = []
+    for p, p_lower in zip(text.split('\n\n'), lowered.split('\n\n')):
+        p = p.strip()
+        if p:
+            paragraphs.append(p)
+            lowered_paragraphs.append(p_lower)
     
     if not found_markers and len(paragraphs) > 1:
         p_segments = {"morning": [], "afternoon": [], "night": []}
         
-        for p in paragraphs:
-            p_lower = p.lower()
-            # Simple keyword matching
-            if any(word in p_lower for word in ["woke up", "breakfast", "8am", "9am", "10am", "morning"]):
-                p_segments["morning"].append(p)
-            elif any(word in p_lower for word in ["lunch", "1pm", "2pm", "afternoon"]):
-                p_segments["afternoon"].append(p)
-            elif any(word in p_lower for word in ["dinner", "night", "evening", "tonight", "bed"]):
-                p_segments["night"].append(p)
-            else:
-                # If no clear hint, we'll try to guess based on existing paragraphs
-                # or just leave it for the positional logic
-                pass
+        for p, p_lower in zip(paragraphs, lowered_paragraphs):
+            # Paragraphs without a hint are left for the positional logic
+            key = _TIME_HINTS.classify(p_lower)
+            if key:
+                p_segments[key].append(p)
         
         # If we found distinct segments via hints, use them
         if any(p_segments.values()):
@@ -4,8 +4,9 @@ Chronicle AI - Recap Generator
 Analyzes previous episodes to create "Previously on Chronicle..." summaries.
 """
 
-from typing import List, Optional
-from datetime import date
+import time
+from typing import Dict, List, Optional, Tuple
+from datetime import date, timedelta
 
 from .models import Entry, Recap
 from .repository import get_repository
@@ -20,6 +21,9 @@ class RecapGenerator:
     
     def __init__(self, repository=None):
         self.repo = repository or get_repository()
+        # Generated recap text keyed by (date, episode summaries sent to the LLM),
+        # so editing or reprocessing an entry produces a fresh recap
+        self._recap_cache: Dict[Tuple[str, str], str] = {}
 
     def generate_recap(self, entries: List[Entry]) -> Recap:
         """
@@ -39,14 +43,22 @@ class RecapGenerator:
         
         # Prepare content for the prompt
         entry_summaries = []
+        entry_ids = []
         for entry in sorted_entries:
-            summary = f"Date: {entry.date}\nTitle: {entry.display_title()}\n"
+            if entry.id is not None:
+                entry_ids.append(entry.id)
+            parts = [f"Date: {entry.date}\nTitle: {entry.display_title()}\n"]
             if entry.conflict_data:
-                summary += f"Conflict: {entry.conflict_data.central_conflict}\n"
-            summary += f"Narrative: {entry.narrative_text or entry.raw_text[:200]}...\n"
-            entry_summaries.append(summary)
+                parts.append(f"Conflict: {entry.conflict_data.central_conflict}\n")
+            parts.append(f"Narrative: {entry.narrative_text or entry.raw_text[:200]}...\n")
+            entry_summaries.append("".join(parts))
         
         episodes_text = "\n---\n".join(entry_summaries)
+        today = date.today().isoformat()
+        cache_key = (today, episodes_text)
+        cached = self._recap_cache.get(cache_key)
+        if cached is not None:
+            return Recap(date=today, content=cached, entry_ids=entry_ids)
         
         prompt = f"""You are a dramatic TV series narrator. 
 Your task is to create a 'Previously on Chronicle...' summary for the upcoming episode.
@@ -62,12 +74,13 @@ GENERATE RECAP (2-3 paragraphs, TV narrator style):
 "Previously on Chronicle..."
 """
 
-        import time
-        start = time.time()
+        start = time.perf_counter()
         content = _make_request(prompt)
-        duration = time.time() - start
+        duration = time.perf_counter() - start
         director_engine.perf_logger.log_event("recap_generation", duration)
         
+        # Only real generations are memoized; a failed call should be retried
+        cacheable = bool(content)
         if not content:
             content = "Previously on Chronicle... The journey continues as our protagonist navigates the complexities of daily life, facing internal struggles and external challenges in an ever-unfolding narrative."
 
@@ -75,10 +88,16 @@ GENERATE RECAP (2-3 paragraphs, TV narrator style):
         if not content.strip().startswith("Previously on Chronicle..."):
             content = f"Previously on Chronicle...\n\n{content}"
 
+        if cacheable:
+            # Keys from previous days can never hit again
+            if any(key[0] != today for key in self._recap_cache):
+                self._recap_cache.clear()
+            self._recap_cache[cache_key] = content
+
         recap = Recap(
-            date=date.today().isoformat(),
+            date=today,
             content=content,
-            entry_ids=[e.id for e in entries if e.id is not None]
+            entry_ids=entry_ids
         )
         
         return recap
@@ -87,16 +106,14 @@ GENERATE RECAP (2-3 paragraphs, TV narrator style):
         """
         Convenience method to generate a recap for the last N days.
         """
-        entries = self.repo.list_entries_last_n_days(days)
-        # Exclude today's entry if it's already there? 
-        # Actually, "previously on" usually excludes the current one.
-        today = date.today().isoformat()
-        past_entries = [e for e in entries if e.date < today]
+        # "Previously on" excludes today's episode; recaps only need the
+        # lightweight columns, not full entries
+        today = date.today()
+        since = (today - timedelta(days=days - 1)).isoformat()
+        past_entries = self.repo.list_entries_for_recap(today.isoformat(), since=since)
         
         # If no past entries in last N days, just take the last N entries regardless of date
         if not past_entries:
-            past_entries = self.repo.list_recent_entries(days)
-            # still filter out today
-            past_entries = [e for e in past_entries if e.date < today]
+            past_entries = self.repo.list_entries_for_recap(today.isoformat(), limit=days)
 
         return self.generate_recap(past_entries)
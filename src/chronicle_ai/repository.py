@@ -5,17 +5,119 @@ SQLite-based storage for diary entries with full CRUD operations.
 """
 
 import sqlite3
-import json
+import threading
+import weakref
 from pathlib import Path
-from typing import List, Optional
-from datetime import date, timedelta
+from typing import Iterator, List, Optional, Tuple
 
-from .models import Entry, ConflictAnalysis, Recap, Season, SeasonArc
+from .models import (
+    Entry, ConflictAnalysis, Recap, Season, SeasonArc,
+    load_conflict_analysis, _json_dumps, _json_loads
+)
 
 
 # Default database location (can be overridden via environment variable)
 DEFAULT_DB_NAME = "chronicle_ai.db"
 
+# Length of the narrative excerpt stored for recap prompts
+RECAP_EXCERPT_CHARS = 200
+
+# Prepared statements kept per connection (sqlite3 defaults to 128)
+STATEMENT_CACHE_SIZE = 256
+
+# INSERT ... RETURNING needs SQLite 3.35+, UPDATE ... FROM needs 3.33+
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+SUPPORTS_UPDATE_FROM = sqlite3.sqlite_version_info >= (3, 33, 0)
+
+# Stored in PRAGMA user_version; bump whenever _init_db changes the schema
+SCHEMA_VERSION = 3
+
+
+def _close_connections(connections: List[sqlite3.Connection]) -> None:
+    """Close and forget a repository's connections."""
+    while connections:
+        try:
+            connections.pop().close()
+        except sqlite3.Error:
+            pass
+
+
+def _row_to_entry(row) -> Entry:
+    """Build an Entry from a row in EntryRepository._SELECT_ENTRY_SQL column order."""
+    # One unpack instead of an index lookup per column
+    (entry_id, entry_date, raw_text, narrative_text, title, title_options, logline,
+     synopsis, keywords, conflict_data, recap_id, season_id, cover_art_path) = row
+    return Entry(
+        id=entry_id,
+        date=entry_date,
+        raw_text=raw_text,
+        narrative_text=narrative_text,
+        title=title,
+        title_options=_json_loads(title_options) if title_options else [],
+        logline=logline,
+        synopsis=synopsis,
+        keywords=_json_loads(keywords) if keywords else [],
+        conflict_data=load_conflict_analysis(conflict_data) if conflict_data else None,
+        recap_id=recap_id,
+        season_id=season_id,
+        cover_art_path=cover_art_path
+    )
+
+
+def _row_to_recap_entry(row) -> Entry:
+    """Build a partial Entry from a row in EntryRepository._RECAP_ENTRY_SQL column order."""
+    central_conflict = row[3]
+    return Entry(
+        id=row[0],
+        date=row[1],
+        title=row[2],
+        narrative_text=row[4],
+        conflict_data=(
+            ConflictAnalysis(central_conflict=central_conflict)
+            if central_conflict is not None else None
+        )
+    )
+
+
+def _row_to_summary_entry(row) -> Entry:
+    """Build a partial Entry from a row in EntryRepository._SUMMARY_ENTRY_SQL column order."""
+    entry_id, entry_date, title, logline = row
+    return Entry(id=entry_id, date=entry_date, title=title, logline=logline)
+
+
+def _recap_columns(entry: Entry) -> tuple:
+    """Denormalized (central_conflict, narrative_prefix) values for an entry."""
+    central_conflict = entry.conflict_data.central_conflict if entry.conflict_data else None
+    excerpt = entry.narrative_text or (entry.raw_text or "")[:RECAP_EXCERPT_CHARS]
+    return central_conflict, excerpt[:RECAP_EXCERPT_CHARS]
+
+
+def _row_to_recap(row) -> Recap:
+    """Build a Recap from a row in EntryRepository._SELECT_RECAP_SQL column order."""
+    return Recap(
+        id=row[0],
+        date=row[1],
+        content=row[2],
+        entry_ids=_json_loads(row[3])
+    )
+
+
+def _row_to_season(row) -> Season:
+    """Build a Season from a row in EntryRepository._SELECT_SEASON_SQL column order."""
+    (season_id, title, start_date, end_date, episode_count, dominant_themes,
+     description, mode, arc_analysis) = row
+    return Season(
+        id=season_id,
+        title=title,
+        start_date=start_date,
+        end_date=end_date,
+        episode_count=episode_count,
+        dominant_themes=_json_loads(dominant_themes) if dominant_themes else [],
+        description=description,
+        mode=mode,
+        arc_analysis=SeasonArc.from_dict(_json_loads(arc_analysis)) if arc_analysis else None
+    )
+
 
 class EntryRepository:
     """
@@ -24,6 +126,59 @@ class EntryRepository:
     Provides CRUD operations and query functions for Entry objects.
     """
     
+    # Statement text is shared so sqlite3's per-connection statement cache hits
+    _SELECT_ENTRY_SQL = (
+        "SELECT id, date, raw_text, narrative_text, title, title_options, logline, synopsis, "
+        "keywords, conflict_data, recap_id, season_id, cover_art_path FROM diary_entries"
+    )
+    _INSERT_ENTRY_SQL = (
+        "INSERT INTO diary_entries (date, raw_text, narrative_text, title, title_options, logline, "
+        "synopsis, keywords, conflict_data, recap_id, season_id, cover_art_path, "
+        "central_conflict, narrative_prefix) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    )
+    _INSERT_ENTRY_RETURNING_SQL = _INSERT_ENTRY_SQL + " RETURNING id"
+    _UPDATE_ENTRY_SQL = (
+        "UPDATE diary_entries SET date = ?, raw_text = ?, narrative_text = ?, title = ?, "
+        "title_options = ?, logline = ?, synopsis = ?, keywords = ?, conflict_data = ?, "
+        "recap_id = ?, season_id = ?, cover_art_path = ?, central_conflict = ?, "
+        "narrative_prefix = ? WHERE id = ?"
+    )
+    # Recaps read only these small columns, never raw_text or the JSON blobs;
+    # a missing lower bound is bound as "" (every ISO date sorts after it)
+    _RECAP_ENTRY_SQL = (
+        "SELECT id, date, title, central_conflict, narrative_prefix FROM diary_entries "
+        "WHERE date < ? AND date >= ? ORDER BY date DESC, id DESC"
+    )
+    _RECAP_ENTRY_LIMITED_SQL = _RECAP_ENTRY_SQL + " LIMIT ?"
+    # Bound LIMIT keeps one prepared statement for every page size
+    _LIST_ENTRIES_SQL = _SELECT_ENTRY_SQL + " ORDER BY date DESC, id DESC"
+    _LIST_ENTRIES_LIMITED_SQL = _LIST_ENTRIES_SQL + " LIMIT ?"
+    # Keyset pages walk idx_diary_date from the last (date, id) seen, no OFFSET scan
+    _LIST_ENTRIES_AFTER_KEY_SQL = (
+        _SELECT_ENTRY_SQL + " WHERE (date, id) < (?, ?) ORDER BY date DESC, id DESC"
+    )
+    _LIST_ENTRIES_BEFORE_DATE_SQL = (
+        _SELECT_ENTRY_SQL + " WHERE date < ? ORDER BY date DESC, id DESC"
+    )
+    _SELECT_RECAP_SQL = "SELECT id, date, content, entry_ids FROM recaps"
+    _LIST_RECAPS_SQL = _SELECT_RECAP_SQL + " ORDER BY date DESC, id DESC"
+    _LIST_RECAPS_LIMITED_SQL = _LIST_RECAPS_SQL + " LIMIT ?"
+    # Listings that only show headlines skip raw_text and the JSON columns
+    _SUMMARY_ENTRY_SQL = (
+        "SELECT id, date, title, logline FROM diary_entries ORDER BY date DESC, id DESC"
+    )
+    _SUMMARY_ENTRY_LIMITED_SQL = _SUMMARY_ENTRY_SQL + " LIMIT ?"
+    # Window computed by SQLite in local time (matching date.today()), bound as an offset
+    _LAST_N_DAYS_SQL = (
+        _SELECT_ENTRY_SQL + " WHERE date >= date('now', 'localtime', ? || ' days') "
+        "AND date <= date('now', 'localtime') ORDER BY date DESC, id DESC"
+    )
+    _SELECT_SEASON_SQL = (
+        "SELECT id, title, start_date, end_date, episode_count, dominant_themes, "
+        "description, mode, arc_analysis FROM seasons"
+    )
+    
     def __init__(self, db_path: Optional[str] = None):
         """
         Initialize the repository with optional custom database path.
@@ -32,19 +187,58 @@ class EntryRepository:
             db_path: Path to SQLite database file. Uses DEFAULT_DB_NAME if not provided.
         """
         self.db_path = db_path or DEFAULT_DB_NAME
+        # One persistent connection per thread, reused across calls
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+        # Closes connections when the repository is collected or at exit
+        self._finalizer = weakref.finalize(self, _close_connections, self._connections)
         self._init_db()
     
     def _get_connection(self) -> sqlite3.Connection:
-        """Get a database connection with row factory configured."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """Get this thread's database connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # check_same_thread=False only so close() can run from any thread;
+            # each connection is still used by the thread that opened it
+            conn = sqlite3.connect(
+                self.db_path,
+                check_same_thread=False,
+                cached_statements=STATEMENT_CACHE_SIZE
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            # ~64 MB page cache and up to 256 MB memory-mapped reads per connection
+            conn.execute("PRAGMA cache_size=-64000")
+            conn.execute("PRAGMA mmap_size=268435456")
+            self._local.conn = conn
+            with self._lock:
+                self._connections.append(conn)
         return conn
     
+    def close(self) -> None:
+        """Close all connections opened by this repository."""
+        with self._lock:
+            self._local = threading.local()
+            _close_connections(self._connections)
+    
+    def __enter__(self) -> "EntryRepository":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+    
     def _init_db(self):
         """Initialize the database schema if not exists."""
         conn = self._get_connection()
         cursor = conn.cursor()
         
+        # Databases already at the current schema skip all introspection
+        cursor.execute("PRAGMA user_version")
+        if cursor.fetchone()[0] == SCHEMA_VERSION:
+            return
+        
         # Check if we need to migrate (add new columns)
         cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='diary_entries'")
         table_exists = cursor.fetchone() is not None
@@ -52,7 +246,7 @@ class EntryRepository:
         if table_exists:
             # Check for existing columns and add missing ones
             cursor.execute("PRAGMA table_info(diary_entries)")
-            columns = {row['name'] for row in cursor.fetchall()}
+            columns = {row[1] for row in cursor.fetchall()}
             
             if 'narrative_text' not in columns:
                 cursor.execute("ALTER TABLE diary_entries ADD COLUMN narrative_text TEXT")
@@ -74,6 +268,10 @@ class EntryRepository:
                 cursor.execute("ALTER TABLE diary_entries ADD COLUMN keywords TEXT")
             if 'cover_art_path' not in columns:
                 cursor.execute("ALTER TABLE diary_entries ADD COLUMN cover_art_path TEXT")
+            if 'narrative_prefix' not in columns:
+                cursor.execute("ALTER TABLE diary_entries ADD COLUMN central_conflict TEXT")
+                cursor.execute("ALTER TABLE diary_entries ADD COLUMN narrative_prefix TEXT")
+                self._backfill_recap_columns(cursor)
             
             # Create recaps table if it doesn't exist
             cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='recaps'")
@@ -106,7 +304,7 @@ class EntryRepository:
             else:
                 # Check for missing columns in existing seasons table
                 cursor.execute("PRAGMA table_info(seasons)")
-                season_columns = {row['name'] for row in cursor.fetchall()}
+                season_columns = {row[1] for row in cursor.fetchall()}
                 if 'arc_analysis' not in season_columns:
                     cursor.execute("ALTER TABLE seasons ADD COLUMN arc_analysis TEXT")
         else:
@@ -125,7 +323,9 @@ class EntryRepository:
                     conflict_data TEXT,
                     recap_id INTEGER,
                     season_id INTEGER,
-                    cover_art_path TEXT
+                    cover_art_path TEXT,
+                    central_conflict TEXT,
+                    narrative_prefix TEXT
                 )
             """)
             cursor.execute("""
@@ -150,8 +350,22 @@ class EntryRepository:
                 )
             """)
         
+        # Serves date-range filters and the ORDER BY date DESC, id DESC listings
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_diary_date ON diary_entries(date DESC, id DESC)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_diary_season ON diary_entries(season_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_recaps_date ON recaps(date DESC, id DESC)")
+        
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
         conn.commit()
-        conn.close()
+    
+    def _backfill_recap_columns(self, cursor: sqlite3.Cursor) -> None:
+        """Populate central_conflict/narrative_prefix for rows written before they existed."""
+        cursor.execute(self._SELECT_ENTRY_SQL)
+        updates = [_recap_columns(_row_to_entry(row)) + (row[0],) for row in cursor.fetchall()]
+        cursor.executemany(
+            "UPDATE diary_entries SET central_conflict = ?, narrative_prefix = ? WHERE id = ?",
+            updates
+        )
     
     def create_entry(self, entry: Entry) -> Entry:
         """
@@ -166,31 +380,64 @@ class EntryRepository:
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        cursor.execute(
-            """INSERT INTO diary_entries (date, raw_text, narrative_text, title, title_options, logline, synopsis, keywords, conflict_data, recap_id, season_id, cover_art_path) 
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (
-                entry.date, 
-                entry.raw_text, 
-                entry.narrative_text, 
-                entry.title,
-                json.dumps(entry.title_options) if entry.title_options else None,
-                entry.logline,
-                entry.synopsis,
-                json.dumps(entry.keywords) if entry.keywords else None,
-                json.dumps(entry.conflict_data.to_dict()) if entry.conflict_data else None,
-                entry.recap_id,
-                entry.season_id,
-                entry.cover_art_path
-            )
-        )
-        
-        entry.id = cursor.lastrowid
+        if SUPPORTS_RETURNING:
+            # The id comes back with the insert, unaffected by triggers;
+            # fetchall() steps the statement to completion before commit
+            cursor.execute(self._INSERT_ENTRY_RETURNING_SQL, self._entry_params(entry))
+            entry.id = cursor.fetchall()[0][0]
+        else:
+            cursor.execute(self._INSERT_ENTRY_SQL, self._entry_params(entry))
+            entry.id = cursor.lastrowid
         conn.commit()
-        conn.close()
         
         return entry
     
+    def create_entries(self, entries: List[Entry]) -> List[Entry]:
+        """
+        Create many diary entries in a single transaction.
+        
+        Args:
+            entries: Entry objects to save (ids will be assigned)
+            
+        Returns:
+            The same entries with assigned ids
+        """
+        if not entries:
+            return entries
+        
+        conn = self._get_connection()
+        with conn:
+            # executemany pulls parameters lazily, so no full params list is built
+            conn.executemany(self._INSERT_ENTRY_SQL, map(self._entry_params, entries))
+            # Rows inserted in one transaction get consecutive rowids
+            last_id = conn.execute("SELECT last_insert_rowid()").fetchone()[0]
+        
+        first_id = last_id - len(entries) + 1
+        for offset, entry in enumerate(entries):
+            entry.id = first_id + offset
+        return entries
+    
+    @staticmethod
+    def _entry_params(entry: Entry) -> tuple:
+        """Column values for _INSERT_ENTRY_SQL / _UPDATE_ENTRY_SQL (without id)."""
+        central_conflict, narrative_prefix = _recap_columns(entry)
+        return (
+            entry.date,
+            entry.raw_text,
+            entry.narrative_text,
+            entry.title,
+            _json_dumps(entry.title_options) if entry.title_options else None,
+            entry.logline,
+            entry.synopsis,
+            _json_dumps(entry.keywords) if entry.keywords else None,
+            _json_dumps(entry.conflict_data.to_dict()) if entry.conflict_data else None,
+            entry.recap_id,
+            entry.season_id,
+            entry.cover_art_path,
+            central_conflict,
+            narrative_prefix
+        )
+    
     def update_entry(self, entry: Entry) -> Entry:
         """
         Update an existing entry in the database.
@@ -207,32 +454,45 @@ class EntryRepository:
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        cursor.execute(
-            """UPDATE diary_entries 
-               SET date = ?, raw_text = ?, narrative_text = ?, title = ?, title_options = ?, logline = ?, synopsis = ?, keywords = ?, conflict_data = ?, recap_id = ?, season_id = ?, cover_art_path = ?
-               WHERE id = ?""",
-            (
-                entry.date, 
-                entry.raw_text, 
-                entry.narrative_text, 
-                entry.title, 
-                json.dumps(entry.title_options) if entry.title_options else None,
-                entry.logline,
-                entry.synopsis,
-                json.dumps(entry.keywords) if entry.keywords else None,
-                json.dumps(entry.conflict_data.to_dict()) if entry.conflict_data else None,
-                entry.recap_id,
-                entry.season_id,
-                entry.cover_art_path,
-                entry.id
-            )
-        )
+        cursor.execute(self._UPDATE_ENTRY_SQL, self._entry_params(entry) + (entry.id,))
         
         conn.commit()
-        conn.close()
         
         return entry
     
+    def bulk_update_season_id(self, pairs: List[Tuple[int, int]]) -> None:
+        """
+        Assign season ids to many entries in a single write transaction.
+        
+        Args:
+            pairs: (season_id, entry_id) tuples
+        """
+        if not pairs:
+            return
+        
+        conn = self._get_connection()
+        with conn:
+            # Take the write lock up front instead of upgrading mid-batch
+            conn.execute("BEGIN IMMEDIATE")
+            if not SUPPORTS_UPDATE_FROM:
+                conn.executemany("UPDATE diary_entries SET season_id = ? WHERE id = ?", pairs)
+                return
+            # Stage the assignments in a temp (in-memory) table and apply them
+            # with one UPDATE ... FROM pass; later pairs win like sequential updates
+            conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS season_assignments "
+                "(entry_id INTEGER PRIMARY KEY, season_id INTEGER)"
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO temp.season_assignments (season_id, entry_id) VALUES (?, ?)",
+                pairs
+            )
+            conn.execute(
+                "UPDATE diary_entries SET season_id = a.season_id "
+                "FROM temp.season_assignments AS a WHERE diary_entries.id = a.entry_id"
+            )
+            conn.execute("DELETE FROM temp.season_assignments")
+    
     def get_entry_by_id(self, entry_id: int) -> Optional[Entry]:
         """
         Retrieve an entry by its ID.
@@ -247,56 +507,104 @@ class EntryRepository:
         cursor = conn.cursor()
         
         cursor.execute(
-            "SELECT id, date, raw_text, narrative_text, title, title_options, logline, synopsis, keywords, conflict_data, recap_id, season_id, cover_art_path FROM diary_entries WHERE id = ?",
+            self._SELECT_ENTRY_SQL + " WHERE id = ?",
             (entry_id,)
         )
         row = cursor.fetchone()
-        conn.close()
         
         if row:
-            data = dict(row)
-            if data.get("conflict_data"):
-                data["conflict_data"] = json.loads(data["conflict_data"])
-            if data.get("title_options"):
-                data["title_options"] = json.loads(data["title_options"])
-            if data.get("keywords"):
-                data["keywords"] = json.loads(data["keywords"])
-            return Entry.from_dict(data)
+            return _row_to_entry(row)
         return None
     
-    def list_entries(self, limit: Optional[int] = None) -> List[Entry]:
+    def iter_entries(self, limit: Optional[int] = None,
+                     before_date: Optional[str] = None,
+                     before_id: Optional[int] = None) -> Iterator[Entry]:
+        """
+        Iterate over entries ordered by date descending without loading them all.
+        
+        The generator keeps its cursor open until it is exhausted or closed,
+        so consume it before issuing writes on the same thread.
+        
+        Args:
+            limit: Maximum number of entries to yield (None for all)
+            before_date: Keyset cursor; only yield entries ordered after this date
+            before_id: Id of the last entry seen on before_date (None to skip that whole date)
+            
+        Yields:
+            Entry objects
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        
+        if before_date is None:
+            query, params = self._LIST_ENTRIES_SQL, ()
+        elif before_id is None:
+            query, params = self._LIST_ENTRIES_BEFORE_DATE_SQL, (before_date,)
+        else:
+            query, params = self._LIST_ENTRIES_AFTER_KEY_SQL, (before_date, int(before_id))
+        
+        if limit:
+            if before_date is None:
+                query = self._LIST_ENTRIES_LIMITED_SQL
+            else:
+                query += " LIMIT ?"
+            params += (int(limit),)
+        cursor.execute(query, params)
+        
+        try:
+            for row in cursor:
+                yield _row_to_entry(row)
+        finally:
+            cursor.close()
+    
+    def list_entries(self, limit: Optional[int] = None,
+                     before_date: Optional[str] = None,
+                     before_id: Optional[int] = None) -> List[Entry]:
         """
         List all entries ordered by date descending.
         
+        Pass the date and id of the last entry of one page as before_date and
+        before_id to fetch the next page.
+        
         Args:
             limit: Maximum number of entries to return (None for all)
+            before_date: Keyset cursor; only return entries ordered after this date
+            before_id: Id of the last entry seen on before_date (None to skip that whole date)
             
         Returns:
             List of Entry objects
         """
-        conn = self._get_connection()
-        cursor = conn.cursor()
+        return list(self.iter_entries(limit, before_date, before_id))
+    
+    def list_entries_summary(self, limit: Optional[int] = None) -> List[Entry]:
+        """
+        List lightweight entries ordered by date descending.
         
-        query = "SELECT id, date, raw_text, narrative_text, title, title_options, logline, synopsis, keywords, conflict_data, recap_id, season_id, cover_art_path FROM diary_entries ORDER BY date DESC, id DESC"
-        if limit:
-            query += f" LIMIT {int(limit)}"
-        
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        conn.close()
-        
-        entries = []
-        for row in rows:
-            data = dict(row)
-            if data.get("conflict_data"):
-                data["conflict_data"] = json.loads(data["conflict_data"])
-            if data.get("title_options"):
-                data["title_options"] = json.loads(data["title_options"])
-            if data.get("keywords"):
-                data["keywords"] = json.loads(data["keywords"])
-            entries.append(Entry.from_dict(data))
+        Returned entries only carry id, date, title and logline; raw text,
+        narrative and JSON columns are never read or decoded. They are meant
+        for reading and must not be passed to update_entry.
+        
+        Args:
+            limit: Maximum number of entries to return (None for all)
             
-        return entries
+        Returns:
+            List of partial Entry objects
+        """
+        conn = self._get_connection()
+        if limit:
+            cursor = conn.execute(self._SUMMARY_ENTRY_LIMITED_SQL, (int(limit),))
+        else:
+            cursor = conn.execute(self._SUMMARY_ENTRY_SQL)
+        return [_row_to_summary_entry(row) for row in cursor.fetchall()]
+    
+    def count_entries(self) -> int:
+        """
+        Count stored entries without reading any rows.
+        
+        Returns:
+            Number of diary entries
+        """
+        return self._get_connection().execute("SELECT COUNT(*) FROM diary_entries").fetchone()[0]
     
     def list_recent_entries(self, n: int = 7) -> List[Entry]:
         """
@@ -325,27 +633,10 @@ class EntryRepository:
         cursor = conn.cursor()
         
         cursor.execute(
-            """SELECT id, date, raw_text, narrative_text, title, title_options, logline, synopsis, keywords, conflict_data, recap_id, season_id, cover_art_path 
-               FROM diary_entries 
-               WHERE date >= ? AND date <= ?
-               ORDER BY date DESC, id DESC""",
+            self._SELECT_ENTRY_SQL + " WHERE date >= ? AND date <= ? ORDER BY date DESC, id DESC",
             (start_date, end_date)
         )
-        rows = cursor.fetchall()
-        conn.close()
-        
-        entries = []
-        for row in rows:
-            data = dict(row)
-            if data.get("conflict_data"):
-                data["conflict_data"] = json.loads(data["conflict_data"])
-            if data.get("title_options"):
-                data["title_options"] = json.loads(data["title_options"])
-            if data.get("keywords"):
-                data["keywords"] = json.loads(data["keywords"])
-            entries.append(Entry.from_dict(data))
-            
-        return entries
+        return [_row_to_entry(row) for row in cursor.fetchall()]
     
     def list_entries_last_n_days(self, days: int = 7) -> List[Entry]:
         """
@@ -357,12 +648,32 @@ class EntryRepository:
         Returns:
             List of Entry objects
         """
-        end_date = date.today()
-        start_date = end_date - timedelta(days=days - 1)
-        return self.list_entries_between_dates(
-            start_date.isoformat(),
-            end_date.isoformat()
-        )
+        cursor = self._get_connection().execute(self._LAST_N_DAYS_SQL, (-(days - 1),))
+        return [_row_to_entry(row) for row in cursor.fetchall()]
+    
+    def list_entries_for_recap(self, before: str, since: Optional[str] = None,
+                               limit: Optional[int] = None) -> List[Entry]:
+        """
+        Get lightweight entries for recap prompts, newest first.
+        
+        Returned entries only carry id, date, title, a conflict_data holding
+        just central_conflict, and narrative_text set to a short excerpt.
+        They are meant for reading and must not be passed to update_entry.
+        
+        Args:
+            before: Only include entries dated strictly before this ISO date
+            since: Only include entries on or after this ISO date (None for no bound)
+            limit: Maximum number of entries to return (None for all)
+            
+        Returns:
+            List of partial Entry objects
+        """
+        conn = self._get_connection()
+        if limit:
+            cursor = conn.execute(self._RECAP_ENTRY_LIMITED_SQL, (before, since or "", int(limit)))
+        else:
+            cursor = conn.execute(self._RECAP_ENTRY_SQL, (before, since or ""))
+        return [_row_to_recap_entry(row) for row in cursor.fetchall()]
     
     def delete_entry(self, entry_id: int) -> bool:
         """
@@ -381,7 +692,6 @@ class EntryRepository:
         deleted = cursor.rowcount > 0
         
         conn.commit()
-        conn.close()
         
         return deleted
 
@@ -398,13 +708,12 @@ class EntryRepository:
             (
                 recap.date,
                 recap.content,
-                json.dumps(recap.entry_ids)
+                _json_dumps(recap.entry_ids)
             )
         )
         
         recap.id = cursor.lastrowid
         conn.commit()
-        conn.close()
         
         return recap
 
@@ -413,56 +722,31 @@ class EntryRepository:
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        cursor.execute(
-            "SELECT id, date, content, entry_ids FROM recaps WHERE id = ?",
-            (recap_id,)
-        )
+        cursor.execute(self._SELECT_RECAP_SQL + " WHERE id = ?", (recap_id,))
         row = cursor.fetchone()
-        conn.close()
         
-        if row:
-            data = dict(row)
-            data["entry_ids"] = json.loads(data["entry_ids"])
-            return Recap.from_dict(data)
-        return None
+        return _row_to_recap(row) if row else None
 
     def get_latest_recap(self) -> Optional[Recap]:
         """Retrieve the most recent recap."""
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        cursor.execute(
-            "SELECT id, date, content, entry_ids FROM recaps ORDER BY date DESC, id DESC LIMIT 1"
-        )
+        cursor.execute(self._LIST_RECAPS_LIMITED_SQL, (1,))
         row = cursor.fetchone()
-        conn.close()
         
-        if row:
-            data = dict(row)
-            data["entry_ids"] = json.loads(data["entry_ids"])
-            return Recap.from_dict(data)
-        return None
+        return _row_to_recap(row) if row else None
 
     def list_recaps(self, limit: Optional[int] = None) -> List[Recap]:
         """List recaps ordered by date descending."""
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        query = "SELECT id, date, content, entry_ids FROM recaps ORDER BY date DESC, id DESC"
         if limit:
-            query += f" LIMIT {int(limit)}"
-        
-        cursor.execute(query)
-        rows = cursor.fetchall()
-        conn.close()
-        
-        recaps = []
-        for row in rows:
-            data = dict(row)
-            data["entry_ids"] = json.loads(data["entry_ids"])
-            recaps.append(Recap.from_dict(data))
-            
-        return recaps
+            cursor.execute(self._LIST_RECAPS_LIMITED_SQL, (int(limit),))
+        else:
+            cursor.execute(self._LIST_RECAPS_SQL)
+        return [_row_to_recap(row) for row in cursor.fetchall()]
 
     # --- Season Methods ---
 
@@ -479,16 +763,15 @@ class EntryRepository:
                 season.start_date,
                 season.end_date,
                 season.episode_count,
-                json.dumps(season.dominant_themes),
+                _json_dumps(season.dominant_themes),
                 season.description,
                 season.mode,
-                json.dumps(season.arc_analysis.to_dict()) if season.arc_analysis else None
+                _json_dumps(season.arc_analysis.to_dict()) if season.arc_analysis else None
             )
         )
         
         season.id = cursor.lastrowid
         conn.commit()
-        conn.close()
         
         return season
 
@@ -509,16 +792,15 @@ class EntryRepository:
                 season.start_date,
                 season.end_date,
                 season.episode_count,
-                json.dumps(season.dominant_themes),
+                _json_dumps(season.dominant_themes),
                 season.description,
                 season.mode,
-                json.dumps(season.arc_analysis.to_dict()) if season.arc_analysis else None,
+                _json_dumps(season.arc_analysis.to_dict()) if season.arc_analysis else None,
                 season.id
             )
         )
         
         conn.commit()
-        conn.close()
         return season
 
     def get_season_by_id(self, season_id: int) -> Optional[Season]:
@@ -526,41 +808,18 @@ class EntryRepository:
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        cursor.execute(
-            "SELECT id, title, start_date, end_date, episode_count, dominant_themes, description, mode, arc_analysis FROM seasons WHERE id = ?",
-            (season_id,)
-        )
+        cursor.execute(self._SELECT_SEASON_SQL + " WHERE id = ?", (season_id,))
         row = cursor.fetchone()
-        conn.close()
         
-        if row:
-            data = dict(row)
-            data["dominant_themes"] = json.loads(data["dominant_themes"]) if data.get("dominant_themes") else []
-            if data.get("arc_analysis"):
-                data["arc_analysis"] = json.loads(data["arc_analysis"])
-            return Season.from_dict(data)
-        return None
+        return _row_to_season(row) if row else None
 
     def list_seasons(self) -> List[Season]:
         """List all seasons ordered by start date."""
         conn = self._get_connection()
         cursor = conn.cursor()
         
-        cursor.execute(
-            "SELECT id, title, start_date, end_date, episode_count, dominant_themes, description, mode, arc_analysis FROM seasons ORDER BY start_date DESC"
-        )
-        rows = cursor.fetchall()
-        conn.close()
-        
-        seasons = []
-        for row in rows:
-            data = dict(row)
-            data["dominant_themes"] = json.loads(data["dominant_themes"]) if data.get("dominant_themes") else []
-            if data.get("arc_analysis"):
-                data["arc_analysis"] = json.loads(data["arc_analysis"])
-            seasons.append(Season.from_dict(data))
-            
-        return seasons
+        cursor.execute(self._SELECT_SEASON_SQL + " ORDER BY start_date DESC")
+        return [_row_to_season(row) for row in cursor.fetchall()]
 
     def get_season_by_date(self, target_date: str) -> Optional[Season]:
         """Find a season that covers the given date."""
@@ -568,19 +827,12 @@ class EntryRepository:
         cursor = conn.cursor()
         
         cursor.execute(
-            "SELECT id, title, start_date, end_date, episode_count, dominant_themes, description, mode, arc_analysis FROM seasons WHERE start_date <= ? AND end_date >= ?",
+            self._SELECT_SEASON_SQL + " WHERE start_date <= ? AND end_date >= ?",
             (target_date, target_date)
         )
         row = cursor.fetchone()
-        conn.close()
         
-        if row:
-            data = dict(row)
-            data["dominant_themes"] = json.loads(data["dominant_themes"]) if data.get("dominant_themes") else []
-            if data.get("arc_analysis"):
-                data["arc_analysis"] = json.loads(data["arc_analysis"])
-            return Season.from_dict(data)
-        return None
+        return _row_to_season(row) if row else None
     
     def clear_seasons(self):
         """Delete all seasons and reset season_id in entries."""
@@ -591,7 +843,6 @@ class EntryRepository:
         cursor.execute("UPDATE diary_entries SET season_id = NULL")
         
         conn.commit()
-        conn.close()
 
 
 # Global repository instance for convenience
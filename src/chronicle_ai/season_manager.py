@@ -4,14 +4,16 @@ Chronicle AI - Season Manager
 Logic for organizing episodes into Seasons based on time or narrative chapters.
 """
 
+import time
+import heapq
 import logging
-from typing import List, Optional, Dict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Tuple
 from datetime import datetime
-import json
 
 from .models import Entry, Season
 from .repository import EntryRepository, get_repository
-from .llm_client import _make_request
+from .llm_utils import _make_request, extract_json, OLLAMA_NUM_PARALLEL
 from .director import director_engine
 
 logger = logging.getLogger(__name__)
@@ -61,7 +63,7 @@ class SeasonManager:
                 seasons_data[month_key] = []
             seasons_data[month_key].append(entry)
 
-        season_count = 1
+        planned = []
         sorted_months = sorted(seasons_data.keys())
         
         for month in sorted_months:
@@ -76,17 +78,9 @@ class SeasonManager:
                 episode_count=len(month_entries),
                 mode="default"
             )
-            
-            # Generate metadata
-            self._enhance_season_metadata(season, month_entries, season_count)
-            saved_season = self.repo.create_season(season)
-            
-            # Link entries
-            for entry in month_entries:
-                entry.season_id = saved_season.id
-                self.repo.update_entry(entry)
-            
-            season_count += 1
+            planned.append((season, month_entries))
+        
+        self._save_seasons(planned)
 
     def _organize_smartly(self, entries: List[Entry]):
         """Smart mode: Use LLM to detect life chapters via major events."""
@@ -121,27 +115,18 @@ Ensure every episode is included in exactly one season, and seasons are chronolo
 
 JSON Output:"""
 
-        import time
-        start = time.time()
+        start = time.perf_counter()
         result = _make_request(prompt, timeout=60)
-        duration = time.time() - start
+        duration = time.perf_counter() - start
         director_engine.perf_logger.log_event("season_smart_organization", duration)
         
-        boundaries = []
-        if result:
-            try:
-                import re
-                json_match = re.search(r'\[.*\]', result, re.DOTALL)
-                if json_match:
-                    boundaries = json.loads(json_match.group(0))
-            except Exception as e:
-                logger.error(f"Failed to parse smart season boundaries: {e}")
+        boundaries = extract_json(result, "[") if result else None
 
         if not boundaries:
             logger.warning("Smart detection failed, falling back to monthly.")
             return self._organize_by_month(entries)
 
-        season_count = 1
+        planned = []
         for b in boundaries:
             try:
                 start_idx = b.get('start_index', 0)
@@ -161,29 +146,65 @@ JSON Output:"""
                     description=b.get('reason', ''),
                     mode="smart"
                 )
-                
-                self._enhance_season_metadata(season, season_entries, season_count)
-                saved_season = self.repo.create_season(season)
-                
-                for entry in season_entries:
-                    entry.season_id = saved_season.id
-                    self.repo.update_entry(entry)
-                
-                season_count += 1
+                planned.append((season, season_entries))
             except Exception as e:
                 logger.error(f"Error processing smart season: {e}")
+        
+        self._save_seasons(planned, skip_failed=True)
+
+    def _save_seasons(self, planned: List[Tuple[Season, List[Entry]]], skip_failed: bool = False):
+        """
+        Generate metadata for all seasons concurrently, then save them in order.
+        
+        The LLM calls are independent, so they overlap in worker threads;
+        database writes stay on the calling thread.
+        
+        Args:
+            planned: (season, episodes) pairs in chronological order
+            skip_failed: Log and skip a season that fails instead of raising
+        """
+        if not planned:
+            return
+        workers = max(1, min(len(planned), OLLAMA_NUM_PARALLEL))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(self._enhance_season_metadata, season, episodes, number)
+                for number, (season, episodes) in enumerate(planned, 1)
+            ]
+        
+        # Entries of every season are linked in one batched update at the end;
+        # it also runs when a season fails, so seasons already saved keep their entries
+        assignments = []
+        try:
+            for future, (season, episodes) in zip(futures, planned):
+                try:
+                    future.result()
+                    saved_season = self.repo.create_season(season)
+                    assignments.extend(self._assign_entries(saved_season.id, episodes))
+                except Exception as e:
+                    if not skip_failed:
+                        raise
+                    logger.error("Error saving season %s to %s: %s", season.start_date, season.end_date, e)
+        finally:
+            self.repo.bulk_update_season_id(assignments)
+
+    def _assign_entries(self, season_id: int, entries: List[Entry]) -> List[Tuple[int, int]]:
+        """Set season_id on entries and return the (season_id, entry_id) pairs to persist."""
+        for entry in entries:
+            entry.season_id = season_id
+        return [(season_id, e.id) for e in entries if e.id is not None]
 
     def _enhance_season_metadata(self, season: Season, episodes: List[Entry], season_number: int):
         """Use LLM to generate title and dominant themes for a season."""
         # Collate themes from episodes
-        all_keywords = []
+        counts: Dict[str, int] = {}
         for e in episodes:
-            if e.keywords:
-                all_keywords.extend(e.keywords)
+            for keyword in e.keywords or ():
+                counts[keyword] = counts.get(keyword, 0) + 1
         
         # Take the most frequent keywords as dominant themes if LLM fails
-        from collections import Counter
-        top_themes = [t for t, count in Counter(all_keywords).most_common(5)]
+        # (nlargest is stable, so ties keep first-seen order like most_common)
+        top_themes = heapq.nlargest(5, counts, key=counts.__getitem__)
         season.dominant_themes = top_themes
 
         # Prepare context for metadata generation
@@ -203,19 +224,15 @@ Output a JSON object with:
 JSON Output:"""
 
         result = _make_request(prompt, timeout=40)
-        if result:
-            try:
-                import re
-                json_match = re.search(r'{{.*}}', result, re.DOTALL)
-                if json_match:
-                    meta = json.loads(json_match.group(0))
-                    season.title = meta.get('title', f"Season {season_number}")
-                    season.dominant_themes = meta.get('themes', top_themes)
-                    if not season.description:
-                        season.description = meta.get('description', "")
-                    return
-            except Exception as e:
-                logger.error(f"Failed to parse season metadata: {e}")
+        meta = extract_json(result, "{") if result else None
+        if meta:
+            # Manual seasons keep the title the user chose
+            if not season.title:
+                season.title = meta.get('title', f"Season {season_number}")
+            season.dominant_themes = meta.get('themes', top_themes)
+            if not season.description:
+                season.description = meta.get('description', "")
+            return
         
         # Fallback
         if not season.title:
@@ -235,8 +252,6 @@ JSON Output:"""
         self._enhance_season_metadata(season, entries, len(self.repo.list_seasons()) + 1)
         saved_season = self.repo.create_season(season)
         
-        for entry in entries:
-            entry.season_id = saved_season.id
-            self.repo.update_entry(entry)
+        self.repo.bulk_update_season_id(self._assign_entries(saved_season.id, entries))
             
         return saved_season
@@ -0,0 +1,170 @@
+"""
+Chronicle AI - Semantic Response Cache
+
+Optional cache that reuses a previously generated narrative when a new diary
+entry is a semantic near-duplicate of one already processed (e.g. "went to
+work, coded, went home"). Entries are embedded with a small local
+sentence-transformers model and matched by cosine similarity.
+
+Disabled unless CHRONICLE_SEMANTIC_CACHE_DIR is set and both numpy and
+sentence-transformers are installed.
+"""
+
+import json
+import logging
+import os
+import threading
+from typing import List, Optional
+
+try:
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
+
+
+# Configuration via environment variables
+SEMANTIC_CACHE_DIR = os.getenv("CHRONICLE_SEMANTIC_CACHE_DIR")
+SEMANTIC_CACHE_MODEL = os.getenv("CHRONICLE_SEMANTIC_CACHE_MODEL", "all-MiniLM-L6-v2")
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("CHRONICLE_SEMANTIC_CACHE_THRESHOLD", "0.93"))
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    Nearest-neighbour cache of raw_text -> narrative pairs.
+
+    Embeddings are L2-normalized so cosine similarity is a single matrix-vector
+    product over all stored entries. Each entry carries a context string (the
+    other prompt inputs, e.g. mood and conflict) and only matches lookups with
+    the same context. Both files in the cache directory are append-only:
+    raw float32 rows in embeddings.f32 and one JSON record per line in
+    responses.jsonl.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = SEMANTIC_CACHE_DIR,
+                 threshold: float = SEMANTIC_CACHE_THRESHOLD,
+                 model_name: str = SEMANTIC_CACHE_MODEL):
+        self.cache_dir = cache_dir
+        self.threshold = threshold
+        self.model_name = model_name
+        self._model = None
+        # Row buffer grown by doubling; only the first _count rows are live
+        self._embeddings = None
+        self._count = 0
+        self._contexts: List[str] = []
+        self._responses: List[str] = []
+        self._lock = threading.Lock()
+        self._loaded = False
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache is configured and its dependencies are installed."""
+        return bool(self.cache_dir) and SEMANTIC_CACHE_AVAILABLE
+
+    def _paths(self):
+        return (
+            os.path.join(self.cache_dir, "embeddings.f32"),
+            os.path.join(self.cache_dir, "responses.jsonl"),
+        )
+
+    def _ensure_loaded(self) -> None:
+        """Load the embedding model and any persisted index (caller holds the lock)."""
+        if self._loaded:
+            return
+        self._loaded = True
+        self._model = SentenceTransformer(self.model_name)
+        emb_path, resp_path = self._paths()
+        if os.path.exists(emb_path) or os.path.exists(resp_path):
+            try:
+                dim = self._model.get_sentence_embedding_dimension()
+                with open(resp_path, encoding="utf-8") as f:
+                    records = [json.loads(line) for line in f if line.strip()]
+                # An interrupted append leaves the row bytes and records out of step
+                if os.path.getsize(emb_path) == len(records) * dim * 4:
+                    embeddings = np.fromfile(emb_path, dtype=np.float32).reshape(-1, dim)
+                    self._embeddings, self._count = embeddings, len(records)
+                    self._contexts = [record["context"] for record in records]
+                    self._responses = [record["response"] for record in records]
+                    return
+                logger.warning("Semantic cache index is inconsistent; starting empty")
+            except (OSError, ValueError, KeyError) as e:
+                logger.warning("Could not load semantic cache: %s; starting empty", e)
+            # Appending to a damaged index would keep it misaligned, so drop it
+            for path in (emb_path, resp_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _embed(self, text: str):
+        return self._model.encode([text], normalize_embeddings=True)[0].astype(np.float32)
+
+    def lookup(self, text: str, context: str = "") -> Optional[str]:
+        """
+        Return the cached response for the most similar stored text.
+
+        Args:
+            text: Raw diary text to match
+            context: The other prompt inputs; only entries stored with the
+                same context can match
+
+        Returns:
+            Cached response if similarity meets the threshold, otherwise None
+        """
+        if not self.enabled or not text:
+            return None
+        with self._lock:
+            self._ensure_loaded()
+            if not self._count:
+                return None
+            scores = self._embeddings[:self._count] @ self._embed(text)
+            scores[np.array(self._contexts) != context] = -1.0
+            best = int(np.argmax(scores))
+            if scores[best] >= self.threshold:
+                logger.debug("Semantic cache hit (similarity %.3f)", scores[best])
+                return self._responses[best]
+        return None
+
+    def add(self, text: str, response: str, context: str = "") -> None:
+        """
+        Store a generated response and append it to the persisted index.
+
+        Args:
+            text: Raw diary text the response was generated from
+            response: Generated response to reuse for similar texts
+            context: The other prompt inputs the response was generated with
+        """
+        if not self.enabled or not text or not response:
+            return
+        with self._lock:
+            self._ensure_loaded()
+            vector = self._embed(text)
+            if self._embeddings is None:
+                self._embeddings = np.empty((16, len(vector)), dtype=np.float32)
+            elif self._count == len(self._embeddings):
+                grown = np.empty((2 * self._count, self._embeddings.shape[1]), dtype=np.float32)
+                grown[:self._count] = self._embeddings[:self._count]
+                self._embeddings = grown
+            self._embeddings[self._count] = vector
+            self._count += 1
+            self._contexts.append(context)
+            self._responses.append(response)
+            self._append(vector, context, response)
+
+    def _append(self, vector, context: str, response: str) -> None:
+        emb_path, resp_path = self._paths()
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(emb_path, "ab") as f:
+                f.write(vector.tobytes())
+            with open(resp_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"context": context, "response": response}) + "\n")
+        except OSError as e:
+            logger.warning("Could not persist semantic cache: %s", e)
+
+
+# Shared cache used for narrative generation
+semantic_cache = SemanticCache()
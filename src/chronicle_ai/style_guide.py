@@ -4,11 +4,48 @@ Chronicle AI - Cinematic Style Guide
 Enhances narrative generation with cinematic instructions and sensory layers.
 """
 
-import json
 import os
 import random
+from functools import lru_cache
 from typing import Dict, List, Optional
 
+from .models import _json_loads
+
+# Visual language per scene type, shared by every style guide
+_SCENE_DIRECTIONS = {
+    "morning": "The world awakens in cool, blue tones, shadows long and soft.",
+    "afternoon": "High contrast and sharp lines. The heat of the day is visible in the shimmer.",
+    "night": "Deep blacks and pools of artificial light. Every sound echoes.",
+    "action": "Fast-paced motion blur and tight framing on specific movements.",
+    "reflective": "Lingering close-ups on hands, faces, and small objects."
+}
+
+@lru_cache(maxsize=8)
+def _load_config_cached(config_path: str) -> Dict:
+    """Parse a style config once per path; the result is shared, treat it as read-only."""
+    if os.path.exists(config_path):
+        try:
+            with open(config_path, 'rb') as f:
+                return _json_loads(f.read())
+        except Exception as e:
+            # In a real app we might use a logger, but for now we fallback
+            pass
+    
+    # Fallback defaults in case file is missing or corrupted
+    return {
+        "camera_angles": ["close-up", "wide shot", "tracking shot"],
+        "lighting": ["harsh fluorescent", "golden hour warmth"],
+        "atmospheres": ["heavy with anticipation", "quiet and reflective"],
+        "mood_mappings": {
+            "neutral": {"camera": "wide shot", "lighting": "natural light", "atmosphere": "calm"}
+        },
+        "sensory_elements": {
+            "sounds": ["a distant hum"],
+            "textures": ["a cool breeze"],
+            "smells": ["fresh air"]
+        }
+    }
+
 
 class CinematicStyleGuide:
     """
@@ -28,31 +65,21 @@ class CinematicStyleGuide:
         
         self.config_path = config_path
         self.styles = self._load_config()
+        # Choice pools resolved once instead of per prompt
+        sensory = self.styles.get("sensory_elements", {})
+        self._mood_map = self.styles.get("mood_mappings", {})
+        self._camera_pool = tuple(self.styles.get("camera_angles", ("medium shot",)))
+        self._lighting_pool = tuple(self.styles.get("lighting", ("natural light",)))
+        self._atmosphere_pool = tuple(self.styles.get("atmospheres", ("neutral",)))
+        self._sound_pool = tuple(sensory.get("sounds", ("a subtle hum",)))
+        self._texture_pool = tuple(sensory.get("textures", ("a faint touch",)))
+        self._smell_pool = tuple(sensory.get("smells", ("fresh air",)))
+        # Visual direction for moods fully defined in mood_mappings (no random picks)
+        self._direction_cache: Dict[str, str] = {}
 
     def _load_config(self) -> Dict:
         """Loads configuration from the JSON file, or returns defaults."""
-        if os.path.exists(self.config_path):
-            try:
-                with open(self.config_path, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                # In a real app we might use a logger, but for now we fallback
-                pass
-        
-        # Fallback defaults in case file is missing or corrupted
-        return {
-            "camera_angles": ["close-up", "wide shot", "tracking shot"],
-            "lighting": ["harsh fluorescent", "golden hour warmth"],
-            "atmospheres": ["heavy with anticipation", "quiet and reflective"],
-            "mood_mappings": {
-                "neutral": {"camera": "wide shot", "lighting": "natural light", "atmosphere": "calm"}
-            },
-            "sensory_elements": {
-                "sounds": ["a distant hum"],
-                "textures": ["a cool breeze"],
-                "smells": ["fresh air"]
-            }
-        }
+        return _load_config_cached(self.config_path)
 
     def enhance_prompt(self, base_prompt: str, mood: str = "neutral") -> str:
         """
@@ -65,14 +92,17 @@ class CinematicStyleGuide:
         Returns:
             An enhanced prompt with specific cinematic directives.
         """
-        mood_map = self.styles.get("mood_mappings", {})
+        mood_key = mood.lower()
+        cached = self._direction_cache.get(mood_key)
+        if cached is not None:
+            return base_prompt + cached
         
         # Get style for the specific mood, or pick random ones
-        mapping = mood_map.get(mood.lower(), {})
+        mapping = self._mood_map.get(mood_key, {})
         
-        camera = mapping.get("camera") or random.choice(self.styles.get("camera_angles", ["medium shot"]))
-        lighting = mapping.get("lighting") or random.choice(self.styles.get("lighting", ["natural light"]))
-        atmosphere = mapping.get("atmosphere") or random.choice(self.styles.get("atmospheres", ["neutral"]))
+        camera = mapping.get("camera") or random.choice(self._camera_pool)
+        lighting = mapping.get("lighting") or random.choice(self._lighting_pool)
+        atmosphere = mapping.get("atmosphere") or random.choice(self._atmosphere_pool)
         
         cinematic_instructions = (
             f"\n\nVISUAL DIRECTION:\n"
@@ -82,6 +112,10 @@ class CinematicStyleGuide:
             f"\nMaintain this artistic lens throughout the narrative."
         )
         
+        # Only deterministic directions are reused; partial mappings stay random
+        if mapping.get("camera") and mapping.get("lighting") and mapping.get("atmosphere"):
+            self._direction_cache[mood_key] = cinematic_instructions
+        
         return base_prompt + cinematic_instructions
 
     def get_scene_direction(self, scene_type: str) -> str:
@@ -94,14 +128,7 @@ class CinematicStyleGuide:
         Returns:
             A string describing the visual direction.
         """
-        directions = {
-            "morning": "The world awakens in cool, blue tones, shadows long and soft.",
-            "afternoon": "High contrast and sharp lines. The heat of the day is visible in the shimmer.",
-            "night": "Deep blacks and pools of artificial light. Every sound echoes.",
-            "action": "Fast-paced motion blur and tight framing on specific movements.",
-            "reflective": "Lingering close-ups on hands, faces, and small objects."
-        }
-        return directions.get(scene_type.lower(), "Balanced framing with clear, descriptive visuals.")
+        return _SCENE_DIRECTIONS.get(scene_type.lower(), "Balanced framing with clear, descriptive visuals.")
 
     def add_sensory_layer(self, text: str) -> str:
         """
@@ -116,10 +143,9 @@ class CinematicStyleGuide:
         if not text or len(text) < 10:
             return text
 
-        sensory = self.styles.get("sensory_elements", {})
-        sound = random.choice(sensory.get("sounds", ["a subtle hum"]))
-        texture = random.choice(sensory.get("textures", ["a faint touch"]))
-        smell = random.choice(sensory.get("smells", ["fresh air"]))
+        sound = random.choice(self._sound_pool)
+        texture = random.choice(self._texture_pool)
+        smell = random.choice(self._smell_pool)
 
         # Append sensory details in a way that feels natural for a story
         sensory_addition = f"\n\nUnderneath it all, {sound} persists. There's {texture} in the air, accompanied by the faint scent of {smell}."
@@ -3,17 +3,37 @@ Chronicle AI - Visual Prompts
 Mood-to-Visual Prompt Converter for SD-optimized cover art prompts.
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Tuple, Optional
+from types import MappingProxyType
+from typing import Dict, List, Tuple, Optional, Union
 from .models import Entry
-from .llm_client import detect_mood, _make_request
+from .llm_client import analyze_for_cover, analyze_for_cover_async, analyze_for_cover_batch
+
+logger = logging.getLogger(__name__)
+
+# Narratives packed into one cover analysis request
+VISUAL_BATCH_SIZE = 10
+
+
+def _precompute_mood_parts(library, quality_boosters: str) -> Dict[str, Tuple[str, str]]:
+    """Build each mood's (positive suffix, negative prompt) pair once."""
+    return {
+        mood: (
+            f"{d['elements']}, Lighting: {d['lighting']}, "
+            f"Atmosphere: {d['atmosphere']}, {quality_boosters}",
+            f"low quality, blurry, distorted, {d['negative']}"
+        )
+        for mood, d in library.items()
+    }
+
 
 class MoodToVisualPrompt:
     """
     Converts episode moods and narratives into rich, SD-optimized visual prompts.
     """
     
-    MOOD_LIBRARY = {
+    MOOD_LIBRARY = MappingProxyType({
         "anxious": {
             "elements": "cool blues, harsh shadows, isolated figure, frantic brushstrokes, sharp angles",
             "lighting": "cold fluorescent light, long distorted shadows",
@@ -74,27 +94,21 @@ class MoodToVisualPrompt:
             "atmosphere": "sentimental, soft, dreamlike",
             "negative": "modern, high-tech, sharp, digital, neon, futuristic"
         }
-    }
+    })
 
     QUALITY_BOOSTERS = "masterpiece, 8k, highly detailed, photorealistic, cinematic lighting, dramatic composition, professional photography"
 
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
+    # mood -> (positive suffix after the visual moments, negative prompt)
+    _MOOD_PRECOMPUTED = _precompute_mood_parts(MOOD_LIBRARY, QUALITY_BOOSTERS)
 
-    def _extract_visual_moments(self, narrative: str) -> str:
-        """Extract key visual moments from the episode narrative using LLM."""
-        if not narrative:
-            return ""
-            
-        prompt = f"""Extract 2-3 key visual elements or striking images from this narrative for an image generation prompt.
-Focus on tangible objects, settings, or poses.
-Narrative: {narrative}
-Visual elements (short phrases, comma separated):"""
+    def _compose(self, mood: str, visual_moments: str) -> Tuple[str, str]:
+        """Build the (positive, negative) prompt pair for a mood and its visual moments."""
+        # Default to neutral/peaceful if mood not in library
+        positive_suffix, negative_prompt = self._MOOD_PRECOMPUTED.get(mood) or self._MOOD_PRECOMPUTED["peaceful"]
         
-        result = _make_request(prompt, timeout=20)
-        if result:
-            return result.strip().strip('"')
-        return ""
+        if visual_moments:
+            return f"A {mood} scene, {visual_moments}, {positive_suffix}", negative_prompt
+        return f"A {mood} scene, {positive_suffix}", negative_prompt
 
     def generate_cover_prompt(self, episode: Entry) -> Tuple[str, str]:
         """
@@ -107,29 +121,71 @@ Visual elements (short phrases, comma separated):"""
             A tuple of (positive_prompt, negative_prompt).
         """
         text = episode.narrative_text or episode.raw_text
-        mood = detect_mood(text)
         
-        # Default to neutral/peaceful if mood not in library
-        mood_data = self.MOOD_LIBRARY.get(mood, self.MOOD_LIBRARY["peaceful"])
+        # Mood and visual moments come from a single LLM call
+        analysis = analyze_for_cover(text, tuple(self.MOOD_LIBRARY))
         
-        # Extract visual moments from narrative
-        visual_moments = self._extract_visual_moments(text)
+        return self._compose(analysis["mood"], analysis["visuals"])
+
+    async def generate_cover_prompt_async(self, episode: Entry) -> Tuple[str, str]:
+        """
+        Async version of generate_cover_prompt.
         
-        # Compose positive prompt
-        components = [
-            f"A {mood} scene",
-            visual_moments,
-            mood_data["elements"],
-            f"Lighting: {mood_data['lighting']}",
-            f"Atmosphere: {mood_data['atmosphere']}",
-            self.QUALITY_BOOSTERS
-        ]
+        Args:
+            episode: The Entry object containing narrative and other metadata.
+            
+        Returns:
+            A tuple of (positive_prompt, negative_prompt).
+        """
+        text = episode.narrative_text or episode.raw_text
+        analysis = await analyze_for_cover_async(text, tuple(self.MOOD_LIBRARY))
+        return self._compose(analysis["mood"], analysis["visuals"])
+
+    async def generate_cover_prompts_many(
+        self, episodes: List[Entry], concurrency: int = 8
+    ) -> List[Union[Tuple[str, str], BaseException]]:
+        """
+        Generate cover prompts for many episodes with concurrent requests.
         
-        # Filter out empty components
-        positive_prompt = ", ".join([c for c in components if c])
-        negative_prompt = f"low quality, blurry, distorted, {mood_data['negative']}"
+        All requests share the pooled async client; at most `concurrency`
+        are in flight at once.
+        
+        Args:
+            episodes: Entry objects to generate prompts for
+            concurrency: Maximum number of requests in flight
+            
+        Returns:
+            (positive_prompt, negative_prompt) tuples in episode order; an
+            episode that failed has its exception in place of the tuple
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def _one(episode: Entry) -> Tuple[str, str]:
+            async with semaphore:
+                return await self.generate_cover_prompt_async(episode)
+
+        return await asyncio.gather(*(_one(e) for e in episodes), return_exceptions=True)
+
+    def generate_cover_prompts_batch(self, episodes: List[Entry],
+                                     batch_size: int = VISUAL_BATCH_SIZE) -> List[Tuple[str, str]]:
+        """
+        Generate cover prompts for many episodes, batching the LLM calls.
+        
+        Args:
+            episodes: Entry objects to generate prompts for
+            batch_size: Narratives packed into each cover analysis request
+            
+        Returns:
+            (positive_prompt, negative_prompt) tuples in episode order
+        """
+        texts = [e.narrative_text or e.raw_text for e in episodes]
+        moods = tuple(self.MOOD_LIBRARY)
+        batch_size = max(1, batch_size)
+        analyses: List[Dict[str, str]] = []
+        for start in range(0, len(texts), batch_size):
+            analyses.extend(analyze_for_cover_batch(texts[start:start + batch_size], moods))
         
-        return positive_prompt, negative_prompt
+        return [self._compose(a["mood"], a["visuals"]) for a in analyses]
 
 # Initialize a global instance
 mood_to_visual = MoodToVisualPrompt()
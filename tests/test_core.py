@@ -104,6 +104,18 @@ class TestRepository:
         assert result.id is not None
         assert result.id > 0
     
+    def test_create_entries_batch(self, temp_db):
+        """Test creating several entries in one call."""
+        repo = EntryRepository(temp_db)
+        repo.create_entry(Entry(date="2024-01-01", raw_text="Existing"))
+        entries = [Entry(date=f"2024-01-{i + 2:02d}", raw_text=f"Batch {i}", keywords=["k"]) for i in range(3)]
+        
+        repo.create_entries(entries)
+        
+        assert [e.id for e in entries] == [2, 3, 4]
+        assert repo.get_entry_by_id(entries[2].id).raw_text == "Batch 2"
+        assert repo.get_entry_by_id(entries[0].id).keywords == ["k"]
+    
     def test_get_entry_by_id(self, temp_db):
         """Test retrieving an entry by ID."""
         repo = EntryRepository(temp_db)
@@ -142,6 +154,54 @@ class TestRepository:
         entries = repo.list_entries(limit=5)
         assert len(entries) == 5
     
+    def test_list_entries_summary(self, temp_db):
+        """Test the headline-only listing."""
+        repo = EntryRepository(temp_db)
+        repo.create_entry(Entry(date="2024-01-01", raw_text="Older", title="First", keywords=["a"]))
+        repo.create_entry(Entry(date="2024-01-02", raw_text="Newer", logline="Stakes rise."))
+        
+        entries = repo.list_entries_summary()
+        
+        assert [(e.date, e.title, e.logline) for e in entries] == [
+            ("2024-01-02", None, "Stakes rise."),
+            ("2024-01-01", "First", None)
+        ]
+        assert entries[1].raw_text == "" and entries[1].keywords == []
+        assert len(repo.list_entries_summary(limit=1)) == 1
+
+    def test_count_entries(self, temp_db):
+        """Test counting entries."""
+        repo = EntryRepository(temp_db)
+        assert repo.count_entries() == 0
+        repo.create_entries([Entry(date="2024-01-01", raw_text="One"), Entry(date="2024-01-02", raw_text="Two")])
+        assert repo.count_entries() == 2
+    
+    def test_iter_entries(self, temp_db):
+        """Test lazily iterating entries newest first."""
+        repo = EntryRepository(temp_db)
+        
+        for i in range(3):
+            repo.create_entry(Entry(date=f"2024-01-{i+1:02d}", raw_text=f"Entry {i}"))
+        
+        entries = repo.iter_entries()
+        assert next(entries).date == "2024-01-03"
+        assert [e.date for e in entries] == ["2024-01-02", "2024-01-01"]
+
+    def test_list_entries_keyset_pages(self, temp_db):
+        """Test paging entries with a (date, id) cursor."""
+        repo = EntryRepository(temp_db)
+
+        for day in ["2024-01-01", "2024-01-02", "2024-01-02", "2024-01-03"]:
+            repo.create_entry(Entry(date=day, raw_text=day))
+
+        first = repo.list_entries(limit=2)
+        assert [(e.date, e.id) for e in first] == [("2024-01-03", 4), ("2024-01-02", 3)]
+
+        second = repo.list_entries(limit=2, before_date=first[-1].date, before_id=first[-1].id)
+        assert [(e.date, e.id) for e in second] == [("2024-01-02", 2), ("2024-01-01", 1)]
+
+        assert [e.id for e in repo.list_entries(before_date="2024-01-02")] == [1]
+
     def test_list_entries_between_dates(self, temp_db):
         """Test date range filtering."""
         repo = EntryRepository(temp_db)
@@ -155,6 +215,18 @@ class TestRepository:
         assert len(entries) == 1
         assert entries[0].raw_text == "In range"
     
+    def test_list_entries_last_n_days(self, temp_db):
+        """Test the rolling window ending today."""
+        from datetime import timedelta
+        repo = EntryRepository(temp_db)
+        today = date.today()
+        for offset in (-1, 0, 2, 3):
+            repo.create_entry(Entry(date=(today - timedelta(days=offset)).isoformat(), raw_text=f"Offset {offset}"))
+        
+        entries = repo.list_entries_last_n_days(3)
+        
+        assert [e.raw_text for e in entries] == ["Offset 0", "Offset 2"]
+    
     def test_update_entry(self, temp_db):
         """Test updating an entry."""
         repo = EntryRepository(temp_db)
@@ -169,6 +241,18 @@ class TestRepository:
         assert retrieved.raw_text == "Updated"
         assert retrieved.narrative_text == "New narrative"
     
+    def test_bulk_update_season_id(self, temp_db):
+        """Test assigning seasons to several entries at once."""
+        repo = EntryRepository(temp_db)
+        entries = repo.create_entries([
+            Entry(date="2024-01-01", raw_text="One"),
+            Entry(date="2024-01-02", raw_text="Two")
+        ])
+        
+        repo.bulk_update_season_id([(7, e.id) for e in entries])
+        
+        assert [e.season_id for e in repo.list_entries()] == [7, 7]
+    
     def test_delete_entry(self, temp_db):
         """Test deleting an entry."""
         repo = EntryRepository(temp_db)
@@ -180,6 +264,89 @@ class TestRepository:
         assert deleted is True
         assert repo.get_entry_by_id(created.id) is None
     
+    def test_conflict_data_round_trip(self, temp_db):
+        """Test that stored conflict data reads back equal (decoded on access)."""
+        from chronicle_ai.models import ConflictAnalysis
+        repo = EntryRepository(temp_db)
+        analysis = ConflictAnalysis(internal_conflicts=["doubt"], tension_level=7, archetype="person vs self")
+        created = repo.create_entry(Entry(date="2024-01-15", raw_text="Tense", conflict_data=analysis))
+        
+        retrieved = repo.get_entry_by_id(created.id)
+        
+        assert retrieved.conflict_data == analysis
+        assert retrieved.conflict_data.tension_level == 7
+        assert retrieved.to_dict()["conflict_data"] == analysis.to_dict()
+
+    def test_loaded_entry_copy_and_pickle(self, temp_db):
+        """Test copying and pickling entries whose conflict data is not decoded yet."""
+        import copy
+        import dataclasses
+        import pickle
+        from chronicle_ai.models import ConflictAnalysis, LazyConflictAnalysis
+        repo = EntryRepository(temp_db)
+        analysis = ConflictAnalysis(external_conflicts=["rain"], tension_level=3)
+        created = repo.create_entry(Entry(date="2024-01-15", raw_text="Wet", conflict_data=analysis))
+
+        for clone in (copy.copy, copy.deepcopy, lambda e: pickle.loads(pickle.dumps(e))):
+            assert clone(repo.get_entry_by_id(created.id)).conflict_data == analysis
+
+        lazy = LazyConflictAnalysis('{"tension_level": 3}')
+        for clone in (copy.copy, copy.deepcopy, lambda c: pickle.loads(pickle.dumps(c))):
+            assert clone(lazy).tension_level == 3
+        replaced = dataclasses.replace(lazy, archetype="person vs self")
+        assert (replaced.tension_level, replaced.archetype) == (3, "person vs self")
+
+    def test_list_entries_for_recap(self, temp_db):
+        """Test the lightweight recap listing and its denormalized columns."""
+        from chronicle_ai.models import ConflictAnalysis
+        repo = EntryRepository(temp_db)
+        repo.create_entry(Entry(date="2024-01-14", raw_text="x" * 300, title="Raw"))
+        repo.create_entry(Entry(
+            date="2024-01-15", raw_text="Processed", narrative_text="The hero rose.",
+            conflict_data=ConflictAnalysis(central_conflict="Deadline")
+        ))
+        repo.create_entry(Entry(date="2024-01-16", raw_text="Today"))
+        
+        entries = repo.list_entries_for_recap("2024-01-16", since="2024-01-14")
+        
+        assert [e.date for e in entries] == ["2024-01-15", "2024-01-14"]
+        assert entries[0].narrative_text == "The hero rose."
+        assert entries[0].conflict_data.central_conflict == "Deadline"
+        assert entries[1].narrative_text == "x" * 200
+        assert entries[1].conflict_data is None
+        assert len(repo.list_entries_for_recap("2024-01-16", limit=1)) == 1
+    
+    def test_migrates_legacy_schema(self, temp_db):
+        """Test that an unversioned database is migrated and stamped once."""
+        import sqlite3
+        from chronicle_ai.repository import SCHEMA_VERSION
+        conn = sqlite3.connect(temp_db)
+        conn.execute("CREATE TABLE diary_entries (id INTEGER PRIMARY KEY AUTOINCREMENT, date TEXT NOT NULL, raw_text TEXT NOT NULL)")
+        conn.execute("INSERT INTO diary_entries (date, raw_text) VALUES ('2024-01-15', 'Legacy')")
+        conn.commit()
+        conn.close()
+        
+        repo = EntryRepository(temp_db)
+        
+        assert repo._get_connection().execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        assert repo.list_entries_for_recap("2024-02-01")[0].narrative_text == "Legacy"
+    
+    def test_close_and_reuse(self, temp_db):
+        """Test that a closed repository reopens its connection on demand."""
+        repo = EntryRepository(temp_db)
+        created = repo.create_entry(Entry(date="2024-01-15", raw_text="Persisted"))
+        repo.close()
+        
+        assert repo.get_entry_by_id(created.id).raw_text == "Persisted"
+    
+    def test_context_manager_closes(self, temp_db):
+        """Test that leaving the with-block closes the repository's connections."""
+        with EntryRepository(temp_db) as repo:
+            repo.create_entry(Entry(date="2024-01-15", raw_text="Scoped"))
+        
+        assert repo._connections == []
+        repo.close()
+    
     def test_delete_nonexistent_entry(self, temp_db):
         """Test deleting a non-existent entry."""
         repo = EntryRepository(temp_db)
@@ -187,5 +354,125 @@ class TestRepository:
         assert deleted is False
 
 
+class TestResponseCache:
+    """Tests for the Ollama ResponseCache."""
+    
+    def test_lru_eviction(self):
+        """Test that the in-memory layer evicts the least recently used key."""
+        from chronicle_ai.llm_utils import ResponseCache
+        cache = ResponseCache(maxsize=2)
+        cache.set("a", "1")
+        cache.set("b", "2")
+        cache.get("a")
+        cache.set("c", "3")
+        
+        assert cache.get("a") == "1"
+        assert cache.get("b") is None
+        assert cache.get("c") == "3"
+    
+    def test_persistent_layer(self):
+        """Test that responses survive across cache instances."""
+        from chronicle_ai.llm_utils import ResponseCache
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "responses.sqlite")
+            key = ResponseCache.make_key({"model": "m", "prompt": "p"})
+            first = ResponseCache(db_path=path)
+            first.set(key, "cached response")
+            first.close()
+            
+            second = ResponseCache(db_path=path)
+            assert second.get(key) == "cached response"
+            second.close()
+
+    def test_async_duplicate_requests_coalesced(self):
+        """Test that identical concurrent async prompts share one request."""
+        import asyncio
+        from unittest.mock import patch
+        from chronicle_ai import llm_utils
+        calls = []
+
+        async def slow_post(payload, timeout):
+            calls.append(payload["prompt"])
+            await asyncio.sleep(0.01)
+            return "shared answer"
+
+        async def run():
+            prompt = "coalesce me " + str(id(calls))
+            return await asyncio.gather(*(llm_utils._make_request_async(prompt) for _ in range(3)))
+
+        with patch.object(llm_utils, "_post_generate_async", side_effect=slow_post):
+            results = asyncio.run(run())
+
+        assert results == ["shared answer"] * 3
+        assert len(calls) == 1
+        assert not llm_utils._ASYNC_INFLIGHT
+
+    def test_async_leader_failure_reaches_waiters(self):
+        """Test that waiters see the leader's exception rather than a cancellation."""
+        import asyncio
+        from unittest.mock import patch
+        from chronicle_ai import llm_utils
+
+        async def failing_post(payload, timeout):
+            await asyncio.sleep(0.01)
+            raise ValueError("bad payload")
+
+        async def run():
+            prompt = "fail me " + str(id(self))
+            return await asyncio.gather(
+                *(llm_utils._make_request_async(prompt) for _ in range(3)), return_exceptions=True
+            )
+
+        with patch.object(llm_utils, "_post_generate_async", side_effect=failing_post):
+            results = asyncio.run(run())
+
+        assert all(isinstance(r, ValueError) for r in results)
+        assert not llm_utils._ASYNC_INFLIGHT
+
+    def test_use_cache_false_bypasses_cache(self):
+        """Test that use_cache=False regenerates and refreshes the cached response."""
+        from unittest.mock import patch
+        from chronicle_ai import llm_utils
+        prompt = "regenerate me " + str(id(self))
+
+        with patch.object(llm_utils, "_post_generate", side_effect=["first", "second"]) as post:
+            assert llm_utils._make_request(prompt) == "first"
+            assert llm_utils._make_request(prompt) == "first"
+            assert llm_utils._make_request(prompt, use_cache=False) == "second"
+            assert llm_utils._make_request(prompt) == "second"
+
+        assert post.call_count == 2
+
+
+class TestSemanticCache:
+    """Tests for the optional semantic response cache."""
+    
+    def test_context_separates_entries_and_index_reloads(self):
+        """Test that entries only match their own context and survive a reload."""
+        np = pytest.importorskip("numpy")
+        pytest.importorskip("sentence_transformers")
+        from chronicle_ai.semantic_cache import SemanticCache
+
+        class FakeModel:
+            def get_sentence_embedding_dimension(self):
+                return 2
+
+            def encode(self, texts, normalize_embeddings=True):
+                return np.array([[1.0, 0.0]])
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = SemanticCache(cache_dir=tmp, threshold=0.9)
+            cache._model, cache._loaded = FakeModel(), True
+            cache.add("went to work", "calm narrative", "calm")
+            
+            assert cache.lookup("went to work", "calm") == "calm narrative"
+            assert cache.lookup("went to work", "tense") is None
+            
+            reloaded = SemanticCache(cache_dir=tmp, threshold=0.9)
+            with pytest.MonkeyPatch.context() as mp:
+                mp.setattr("chronicle_ai.semantic_cache.SentenceTransformer", lambda name: FakeModel())
+                assert reloaded.lookup("went to work", "calm") == "calm narrative"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
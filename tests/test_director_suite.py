@@ -39,6 +39,14 @@ class TestEpisodeStructure:
         assert result["valid"] is False
         assert any("repetition" in issue.lower() for issue in result["issues"])
 
+    def test_validate_repeated_phrase(self):
+        validator = EpisodeStructure()
+        narrative = ("I walked to the old mill at dawn. Later I walked to the old mill again. "
+                     "At dusk I walked to the old mill one last time.")
+        result = validator.validate(narrative)
+        assert result["sentence_count"] == 3
+        assert "Repetition detected in sentences" in result["issues"]
+
 class TestConflictDetector:
     @patch("chronicle_ai.conflict._make_request")
     def test_analyze_entry(self, mock_request):
@@ -51,6 +59,15 @@ class TestConflictDetector:
         assert "doubt" in result.internal_conflicts
         assert result.archetype == "person vs time"
 
+    @patch("chronicle_ai.conflict._make_request")
+    def test_analyze_entry_with_chatter(self, mock_request):
+        mock_request.return_value = 'Here\'s the JSON:\n```json\n{"internal": [], "external": ["storm"], "tension": 4, "archetype": "person vs environment", "central_conflict": "Caught in the rain."}\n```\nHope that helps!'
+        detector = ConflictDetector()
+        result = detector.analyze_entry("The storm flooded the road home.")
+        assert result.tension_level == 4
+        assert result.external_conflicts == ["storm"]
+        assert result.central_conflict == "Caught in the rain."
+
 class TestRecapGenerator:
     @patch("chronicle_ai.recap._make_request")
     def test_generate_recap(self, mock_request):
@@ -69,6 +86,35 @@ class TestRecapGenerator:
         assert 1 in recap.entry_ids
         assert 2 in recap.entry_ids
 
+    @patch("chronicle_ai.recap._make_request")
+    def test_generate_recap_memoized(self, mock_request):
+        mock_request.return_value = "Previously on Chronicle... Things happened."
+        generator = RecapGenerator(MagicMock())
+        entries = [
+            Entry(id=1, date="2024-01-01", title="Day 1", narrative_text="Start"),
+            Entry(id=2, date="2024-01-02", title="Day 2", narrative_text="Middle")
+        ]
+        
+        first = generator.generate_recap(entries)
+        second = generator.generate_recap(list(reversed(entries)))
+        
+        assert mock_request.call_count == 1
+        assert second.content == first.content
+        assert second is not first
+
+    @patch("chronicle_ai.recap._make_request")
+    def test_generate_recap_cache_follows_edits(self, mock_request):
+        mock_request.side_effect = ["Previously on Chronicle... One.", "Previously on Chronicle... Two."]
+        generator = RecapGenerator(MagicMock())
+        entry = Entry(id=1, date="2024-01-01", title="Day 1", narrative_text="Start")
+        
+        first = generator.generate_recap([entry])
+        entry.narrative_text = "A rewritten start"
+        second = generator.generate_recap([entry])
+        
+        assert mock_request.call_count == 2
+        assert second.content != first.content
+
 class TestSeasonManager:
     def test_organize_by_month(self):
         repo = MagicMock()
@@ -94,6 +140,109 @@ class TestSeasonManager:
             assert season_jan.end_date == "2024-01-15"
             assert season_jan.episode_count == 2
 
+    def test_save_seasons_links_saved_seasons_on_failure(self):
+        repo = MagicMock()
+        repo.create_season.side_effect = [Season(id=7), RuntimeError("disk full")]
+        manager = SeasonManager(repo)
+        planned = [
+            (Season(start_date="2024-01-01"), [Entry(id=1, date="2024-01-01")]),
+            (Season(start_date="2024-02-01"), [Entry(id=2, date="2024-02-01")])
+        ]
+        
+        with patch.object(manager, "_enhance_season_metadata"):
+            with pytest.raises(RuntimeError):
+                manager._save_seasons(planned)
+        
+        repo.bulk_update_season_id.assert_called_once_with([(7, 1)])
+
+    @patch("chronicle_ai.season_manager._make_request")
+    def test_enhance_season_metadata_parses_json(self, mock_request):
+        mock_request.return_value = 'Sure! {"title": "The Rising Tide", "themes": ["work"], "description": "Growth."}'
+        manager = SeasonManager(MagicMock())
+        season = Season(start_date="2024-01-01", end_date="2024-01-31")
+        
+        manager._enhance_season_metadata(season, [Entry(date="2024-01-05", raw_text="Jan", keywords=["gym"])], 1)
+        
+        assert season.title == "The Rising Tide"
+        assert season.dominant_themes == ["work"]
+        assert season.description == "Growth."
+
+class TestCoverPrompts:
+    @patch("chronicle_ai.llm_client._make_request")
+    def test_generate_cover_prompts_batch(self, mock_request):
+        from chronicle_ai.visual_prompts import MoodToVisualPrompt
+        mock_request.return_value = ('{"covers": [{"index": 2, "mood": "triumphant", "visuals": "city rooftop, neon sign"}, '
+                                     '{"index": 1, "mood": "lonely", "visuals": "rain on a window"}]}')
+        episodes = [
+            Entry(date="2024-01-01", narrative_text="It rained all day and I felt alone."),
+            Entry(date="2024-01-02", narrative_text="We finally won the big game tonight!")
+        ]
+        
+        prompts = MoodToVisualPrompt().generate_cover_prompts_batch(episodes)
+        
+        assert mock_request.call_count == 1
+        assert prompts[0][0].startswith("A lonely scene, rain on a window")
+        assert prompts[1][0].startswith("A triumphant scene, city rooftop, neon sign")
+        assert all(negative.startswith("low quality") for _, negative in prompts)
+
+    def test_generate_cover_prompts_many(self):
+        import asyncio
+        from unittest.mock import AsyncMock
+        from chronicle_ai.visual_prompts import MoodToVisualPrompt
+        episodes = [Entry(date=f"2024-01-0{i}", raw_text=f"Day {i} at the beach.") for i in range(1, 4)]
+        answer = '{"mood": "peaceful", "visuals": "sand, waves"}'
+        
+        with patch("chronicle_ai.llm_client._make_request_async", new=AsyncMock(return_value=answer)) as mock_request:
+            prompts = asyncio.run(MoodToVisualPrompt().generate_cover_prompts_many(episodes, concurrency=2))
+        
+        assert mock_request.await_count == 3
+        assert all(positive.startswith("A peaceful scene, sand, waves") for positive, _ in prompts)
+
+    def test_cover_prompt_paths_agree(self):
+        import asyncio
+        from unittest.mock import AsyncMock
+        from chronicle_ai.visual_prompts import MoodToVisualPrompt
+        answer = '{"mood": "lonely", "visuals": "empty street, one lamp"}'
+        episode = Entry(date="2024-01-01", raw_text="Walked home alone.")
+        generator = MoodToVisualPrompt()
+        
+        with patch("chronicle_ai.llm_client._make_request", return_value=answer), \
+                patch("chronicle_ai.llm_client._make_request_async", new=AsyncMock(return_value=answer)):
+            single = generator.generate_cover_prompt(episode)
+            concurrent = asyncio.run(generator.generate_cover_prompt_async(episode))
+            batched = generator.generate_cover_prompts_batch([episode])[0]
+        
+        assert single == concurrent == batched
+        assert single[0].startswith("A lonely scene")
+
+    @patch("chronicle_ai.llm_client._make_request")
+    def test_generate_cover_prompt_single_call(self, mock_request):
+        from chronicle_ai.visual_prompts import MoodToVisualPrompt
+        mock_request.return_value = '{"mood": "lonely", "visuals": "empty street, one lamp"}'
+        
+        positive, negative = MoodToVisualPrompt().generate_cover_prompt(Entry(date="2024-01-01", raw_text="Walked home alone."))
+        
+        assert mock_request.call_count == 1
+        assert positive.startswith("A lonely scene, empty street, one lamp")
+        assert "crowds" in negative
+
+class TestPromptBudget:
+    def test_truncate_tokens_character_fallback(self):
+        from chronicle_ai import llm_client
+        text = "word " * 100
+        with patch.object(llm_client, "TIKTOKEN_AVAILABLE", False), \
+                patch.object(llm_client, "_tokenizer", None):
+            assert llm_client._truncate_tokens(text, 10) == text[:40]
+            assert llm_client._truncate_tokens("short", 10) == "short"
+
+    def test_truncate_tokens_with_tiktoken(self):
+        pytest.importorskip("tiktoken")
+        from chronicle_ai.llm_client import _truncate_tokens, _get_tokenizer
+        text = "The rain kept falling on the quiet street. " * 50
+        truncated = _truncate_tokens(text, 20)
+        assert text.startswith(truncated)
+        assert len(_get_tokenizer().encode(truncated)) <= 20
+
 class TestSynopsisGeneration:
     @patch("chronicle_ai.llm_client._make_request")
     def test_generate_synopsis(self, mock_request):
@@ -121,5 +270,79 @@ class TestSynopsisGeneration:
         assert len(logline_words) <= 15
         assert len(result["keywords"]) == 5
 
+    @patch("chronicle_ai.llm_client._make_request")
+    def test_generate_synopsis_ignores_surrounding_text(self, mock_request):
+        from chronicle_ai.llm_client import generate_synopsis
+        mock_request.return_value = 'Sure! Here you go: {"logline": "A quiet day.", "synopsis": "Nothing much.", "keywords": ["calm"]} Also {"note": "extra"}'
+        
+        result = generate_synopsis("Context")
+        
+        assert result["logline"] == "A quiet day."
+        assert result["keywords"] == ["calm"]
+
+class TestFusedGeneration:
+    @patch("chronicle_ai.llm_client._make_request")
+    def test_generate_narrative_and_title(self, mock_request):
+        from chronicle_ai.llm_client import generate_narrative_and_title
+        mock_request.return_value = '{"narrative": "The office hums as the deadline looms.", "title": "\\"Deadline Dawn\\""}'
+        
+        narrative, title = generate_narrative_and_title("Worked late on the quarterly report.")
+        
+        assert mock_request.call_count == 1
+        assert mock_request.call_args.kwargs["format"] == "json"
+        assert narrative.startswith("The office hums as the deadline looms.")
+        assert title == "Deadline Dawn"
+
+    @patch("chronicle_ai.llm_client._make_request")
+    def test_ensure_narrative_and_title_sets_title_options(self, mock_request):
+        from chronicle_ai.llm_client import ensure_narrative_and_title
+        mock_request.return_value = '{"narrative": "Rain taps on the greenhouse glass.", "title": "Glass Rain"}'
+        entry = Entry(date="2024-03-02", raw_text="Repotted the ferns while it rained.")
+        
+        ensure_narrative_and_title(entry)
+        
+        assert mock_request.call_count == 1
+        assert entry.title == "Glass Rain"
+        assert entry.title_options == [{"title": "Glass Rain", "pattern": "Direct", "score": 0.5}]
+
+    @patch("chronicle_ai.llm_client._make_request")
+    def test_generate_title_structured_output(self, mock_request):
+        from chronicle_ai.llm_client import generate_title
+        mock_request.return_value = '{"title": "The Long Commute"}'
+        
+        assert generate_title("Stuck in traffic for two hours.") == "The Long Commute"
+        assert mock_request.call_args.kwargs["format"]["required"] == ["title"]
+
+class TestAsyncProcessing:
+    def test_aprocess_entries(self):
+        import asyncio
+        from unittest.mock import AsyncMock
+        from chronicle_ai.llm_client import aprocess_entries
+        
+        entries = [Entry(id=i, date=f"2024-01-0{i}", raw_text=f"Day {i} at work.") for i in range(1, 4)]
+        with patch("chronicle_ai.llm_client._make_request_async", new=AsyncMock(return_value="A Title")) as mock_request:
+            asyncio.run(aprocess_entries(entries, concurrency=2))
+        
+        # One narrative and one title request per entry
+        assert mock_request.await_count == 6
+        assert all(e.narrative_text and e.title == "A Title" for e in entries)
+
+    def test_process_entries_runs_eagerly(self):
+        from chronicle_ai.llm_client import process_entries
+        entries = [Entry(id=i, date=f"2024-01-0{i}", raw_text=f"Day {i} at work.") for i in range(1, 3)]
+
+        def fake_process(entry, force=False):
+            if entry.id == 2:
+                raise RuntimeError("offline")
+            entry.title = "Done"
+
+        with patch("chronicle_ai.llm_client.process_entry", side_effect=fake_process):
+            results = process_entries(entries, max_workers=2)
+
+        assert isinstance(results, list)
+        errors = {entry.id: error for entry, error in results}
+        assert errors[1] is None and entries[0].title == "Done"
+        assert isinstance(errors[2], RuntimeError)
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
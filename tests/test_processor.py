@@ -1,4 +1,4 @@
-from chronicle_ai.processor import segment_diary_text
+from chronicle_ai.processor import segment_diary_text, KeywordClassifier
 
 test_text_1 = """Morning: I woke up early and had coffee.
 Afternoon: Had lunch with a friend.
@@ -24,5 +24,13 @@ def test():
     print("\nTest 3 (Fallback):")
     print(json.dumps(segment_diary_text(test_text_3), indent=2))
 
+def test_keyword_classifier_priority():
+    classifier = KeywordClassifier((("first", ("alpha", "beta")), ("second", ("alp", "gamma"))))
+    # Overlapping keywords resolve to the higher-priority group
+    assert classifier.classify("xalphax") == "first"
+    assert classifier.classify("gamma then beta") == "first"
+    assert classifier.classify("only gamma") == "second"
+    assert classifier.classify("nothing here") is None
+
 if __name__ == "__main__":
     test()